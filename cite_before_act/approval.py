@@ -1,15 +1,17 @@
 """Approval workflow state management."""
 
 import asyncio
+import functools
 import glob
 import json
 import os
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from cite_before_act.slack.client import SlackClient
 from cite_before_act.slack.handlers import SlackHandler
@@ -124,6 +126,7 @@ class ApprovalManager:
         local_approval: Optional[LocalApproval] = None,
         default_timeout_seconds: int = 300,
         use_local_fallback: bool = True,
+        send_workers: int = 4,
     ):
         """Initialize approval manager.
 
@@ -137,6 +140,7 @@ class ApprovalManager:
             local_approval: Optional local approval handler (CLI/GUI)
             default_timeout_seconds: Default timeout for approval requests
             use_local_fallback: If True, use local approval if platforms fail or aren't configured
+            send_workers: Threads reserved for blocking platform API calls
         """
         self.slack_client = slack_client
         self.slack_handler = slack_handler
@@ -147,6 +151,8 @@ class ApprovalManager:
         self.local_approval = local_approval
         self.use_local_fallback = use_local_fallback
         self.default_timeout_seconds = default_timeout_seconds
+        self.send_workers = send_workers
+        self._send_executor: Optional[ThreadPoolExecutor] = None
         self._pending_approvals: Dict[str, ApprovalRequest] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
 
@@ -182,71 +188,50 @@ class ApprovalManager:
 
         self._pending_approvals[approval_id] = request
 
-        # Track if any platform sent successfully
-        any_platform_sent = False
+        # Send platform messages in the background. Slack and Webex use blocking
+        # HTTP clients, so their sends run on the send threads; none of them hold up
+        # the caller, which only needs the wait task below.
+        send_tasks = []
 
-        # Send Slack message if client available
         if self.slack_client:
-            try:
-                self.slack_client.send_approval_request(
+            send_tasks.append(asyncio.create_task(self._send_platform_request(
+                "Slack",
+                self._send_slack_approval_request(
                     approval_id=approval_id,
                     tool_name=tool_name,
                     description=description,
                     arguments=arguments,
-                )
-                any_platform_sent = True
-
-                # Register callback with handler
-                if self.slack_handler:
-                    self.slack_handler.register_approval_callback(
-                        approval_id,
-                        lambda aid, approved: self._handle_approval_response(aid, approved),
-                    )
-            except Exception as e:
-                print(f"Error sending Slack approval request: {e}", file=sys.stderr)
+                ),
+                self.slack_handler,
+                approval_id,
+            )))
 
-        # Send Webex message if client available
         if self.webex_client:
-            try:
-                self.webex_client.send_approval_request(
+            send_tasks.append(asyncio.create_task(self._send_platform_request(
+                "Webex",
+                self._run_blocking(
+                    self.webex_client.send_approval_request,
                     approval_id=approval_id,
                     tool_name=tool_name,
                     description=description,
                     arguments=arguments,
-                )
-                any_platform_sent = True
-
-                # Register callback with handler
-                if self.webex_handler:
-                    self.webex_handler.register_approval_callback(
-                        approval_id,
-                        lambda aid, approved: self._handle_approval_response(aid, approved),
-                    )
-            except Exception as e:
-                print(f"Error sending Webex approval request: {e}", file=sys.stderr)
+                ),
+                self.webex_handler,
+                approval_id,
+            )))
 
-        # Send Teams message if client available
         if self.teams_client:
-            try:
-                # Teams requires async send
-                asyncio.create_task(
-                    self.teams_client.send_approval_request(
-                        approval_id=approval_id,
-                        tool_name=tool_name,
-                        description=description,
-                        arguments=arguments,
-                    )
-                )
-                any_platform_sent = True
-
-                # Register callback with handler
-                if self.teams_handler:
-                    self.teams_handler.register_approval_callback(
-                        approval_id,
-                        lambda aid, approved: self._handle_approval_response(aid, approved),
-                    )
-            except Exception as e:
-                print(f"Error sending Teams approval request: {e}", file=sys.stderr)
+            send_tasks.append(asyncio.create_task(self._send_platform_request(
+                "Teams",
+                self.teams_client.send_approval_request(
+                    approval_id=approval_id,
+                    tool_name=tool_name,
+                    description=description,
+                    arguments=arguments,
+                ),
+                self.teams_handler,
+                approval_id,
+            )))
 
         # Always use local approval in parallel (not just as fallback)
         # This enables multiple approval methods simultaneously:
@@ -254,21 +239,10 @@ class ApprovalManager:
         # - Native OS dialogs (macOS/Windows)
         # - File-based approval (all platforms, shown in logs)
         if self.use_local_fallback:
-            if not self.local_approval:
-                # Create local approval handler
-                # Use native dialogs on macOS/Windows, file-based on Linux
-                # If any platform is configured, disable native dialogs but keep file-based logging
-                use_native = os.getenv("USE_GUI_APPROVAL", "true").lower() == "true"
-                if any_platform_sent:
-                    # When any platform is enabled, skip native popup but keep CLI logging
-                    use_native = False
-                self.local_approval = LocalApproval(
-                    use_native_dialog=use_native,
-                    use_file_based=True,  # Always show file-based instructions
-                )
-            
             # Request local approval asynchronously (runs in parallel with Slack)
-            asyncio.create_task(self._request_local_approval(approval_id, tool_name, description, arguments))
+            asyncio.create_task(
+                self._request_local_approval(approval_id, tool_name, description, arguments, send_tasks)
+            )
 
         # Start cleanup task if not already running
         if self._cleanup_task is None or self._cleanup_task.done():
@@ -321,12 +295,78 @@ class ApprovalManager:
 
         return await request.wait_for_resolution(timeout=timeout)
 
+    def _run_blocking(self, func: Callable[..., Any], **kwargs: Any) -> "asyncio.Future[Any]":
+        """Run a blocking platform API call on the approval send threads.
+
+        Sends get their own small pool rather than the event loop's default
+        executor, so slow or timing-out platform APIs cannot starve the other
+        work the proxy hands to that executor.
+
+        Args:
+            func: Blocking callable
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Future resolving to func's return value
+        """
+        if self._send_executor is None:
+            self._send_executor = ThreadPoolExecutor(
+                max_workers=self.send_workers,
+                thread_name_prefix="approval-send",
+            )
+        return asyncio.get_running_loop().run_in_executor(
+            self._send_executor, functools.partial(func, **kwargs)
+        )
+
+    async def _send_slack_approval_request(self, **kwargs: Any) -> str:
+        """Send an approval request to Slack without blocking the event loop.
+
+        Args:
+            **kwargs: Arguments for SlackClient.send_approval_request
+
+        Returns:
+            Timestamp of the sent message
+        """
+        return await self._run_blocking(self.slack_client.send_approval_request, **kwargs)
+
+    async def _send_platform_request(
+        self,
+        platform: str,
+        send: Awaitable[Any],
+        handler: Optional[Any],
+        approval_id: str,
+    ) -> bool:
+        """Send an approval request on one platform and register its response callback.
+
+        Args:
+            platform: Platform name, for error messages
+            send: Awaitable that sends the approval message
+            handler: Optional platform handler to register the response callback with
+            approval_id: Unique approval ID
+
+        Returns:
+            True if the message was sent, False otherwise
+        """
+        try:
+            await send
+        except Exception as e:
+            print(f"Error sending {platform} approval request: {e}", file=sys.stderr)
+            return False
+
+        if handler:
+            handler.register_approval_callback(
+                approval_id,
+                lambda aid, approved: self._handle_approval_response(aid, approved),
+            )
+        return True
+
     async def _request_local_approval(
         self,
         approval_id: str,
         tool_name: str,
         description: str,
         arguments: dict,
+        send_tasks: List["asyncio.Task[bool]"],
     ) -> None:
         """Request approval via local mechanism.
 
@@ -335,9 +375,22 @@ class ApprovalManager:
             tool_name: Name of the tool
             description: Description of the action
             arguments: Arguments that would be passed
+            send_tasks: Platform send tasks started for this request
         """
         if not self.local_approval:
-            return
+            # Create local approval handler once we know whether any platform got the message
+            # Use native dialogs on macOS/Windows, file-based on Linux
+            # If any platform is configured, disable native dialogs but keep file-based logging
+            sent = await asyncio.gather(*send_tasks)
+            use_native = os.getenv("USE_GUI_APPROVAL", "true").lower() == "true"
+            if any(sent):
+                # When any platform is enabled, skip native popup but keep CLI logging
+                use_native = False
+            if not self.local_approval:
+                self.local_approval = LocalApproval(
+                    use_native_dialog=use_native,
+                    use_file_based=True,  # Always show file-based instructions
+                )
 
         try:
             approved = await self.local_approval.request_approval(
@@ -1,6 +1,6 @@
 """Mutating tool detection engine with multiple strategies."""
 
-from typing import List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 
 from cite_before_act.debug import debug_log
@@ -222,6 +222,12 @@ class DetectionEngine:
         self.blocklist: Set[str] = set(blocklist or [])
         self.enable_convention = enable_convention
         self.enable_metadata = enable_metadata
+        # (tool name, description, schema description) -> verdict
+        self._verdicts: Dict[Tuple[str, str, str], bool] = {}
+
+    # Upper bound on remembered verdicts; tool sets are small, this only guards
+    # against callers passing unbounded distinct names
+    _MAX_CACHED_VERDICTS = 4096
 
     def is_mutating(
         self,
@@ -231,6 +237,35 @@ class DetectionEngine:
     ) -> bool:
         """Check if a tool is mutating using all enabled strategies.
 
+        The verdict only depends on the tool's name and descriptions, so it is
+        computed once per tool and reused for later calls.
+
+        Args:
+            tool_name: Name of the tool
+            tool_description: Optional description of the tool
+            tool_schema: Optional JSON schema of the tool
+
+        Returns:
+            True if tool is detected as mutating, False otherwise
+        """
+        schema_description = str(tool_schema.get("description", "")) if tool_schema else ""
+        key = (tool_name, tool_description or "", schema_description)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = self._detect_mutating(tool_name, tool_description, tool_schema)
+            if len(self._verdicts) >= self._MAX_CACHED_VERDICTS:
+                self._verdicts.clear()
+            self._verdicts[key] = verdict
+        return verdict
+
+    def _detect_mutating(
+        self,
+        tool_name: str,
+        tool_description: Optional[str] = None,
+        tool_schema: Optional[dict] = None,
+    ) -> bool:
+        """Run all enabled detection strategies for a tool.
+
         Args:
             tool_name: Name of the tool
             tool_description: Optional description of the tool
@@ -239,8 +274,6 @@ class DetectionEngine:
         Returns:
             True if tool is detected as mutating, False otherwise
         """
-        import re
-        
         # Check blocklist first (explicit non-mutating - highest priority override)
         if self.blocklist and tool_name in self.blocklist:
             debug_log("Tool '{}' is in blocklist - non-mutating", tool_name)
@@ -380,6 +413,7 @@ class DetectionEngine:
             tool_name: Name of the tool to add
         """
         self.allowlist.add(tool_name)
+        self._verdicts.clear()
 
     def add_to_blocklist(self, tool_name: str) -> None:
         """Add a tool to the blocklist.
@@ -388,6 +422,7 @@ class DetectionEngine:
             tool_name: Name of the tool to add
         """
         self.blocklist.add(tool_name)
+        self._verdicts.clear()
 
     def remove_from_allowlist(self, tool_name: str) -> None:
         """Remove a tool from the allowlist.
@@ -396,6 +431,7 @@ class DetectionEngine:
             tool_name: Name of the tool to remove
         """
         self.allowlist.discard(tool_name)
+        self._verdicts.clear()
 
     def remove_from_blocklist(self, tool_name: str) -> None:
         """Remove a tool from the blocklist.
@@ -404,4 +440,5 @@ class DetectionEngine:
             tool_name: Name of the tool to remove
         """
         self.blocklist.discard(tool_name)
+        self._verdicts.clear()
 
@@ -1,11 +1,28 @@
 """Slack API client for sending approval requests."""
 
 import json
+import ssl
 import sys
+import threading
 from typing import Optional
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+# TLS context shared by every Slack client in the process. slack_sdk's WebClient
+# otherwise builds a fresh default context (re-reading the CA bundle) for each
+# HTTPS request it makes.
+_shared_ssl_context: Optional[ssl.SSLContext] = None
+_shared_ssl_context_lock = threading.Lock()
+
+
+def _get_shared_ssl_context() -> ssl.SSLContext:
+    """Return the process-wide TLS context for Slack API requests."""
+    global _shared_ssl_context
+    with _shared_ssl_context_lock:
+        if _shared_ssl_context is None:
+            _shared_ssl_context = ssl.create_default_context()
+        return _shared_ssl_context
+
 
 class SlackClient:
     """Client for interacting with Slack API."""
@@ -15,6 +32,7 @@ class SlackClient:
         token: str,
         channel: Optional[str] = None,
         user_id: Optional[str] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
     ):
         """Initialize Slack client.
 
@@ -22,8 +40,9 @@ class SlackClient:
             token: Slack bot token (starts with xoxb-)
             channel: Optional channel ID (C1234567890) or name (#approvals) to send messages to
             user_id: Optional user ID to send direct messages to
+            ssl_context: Optional TLS context; defaults to one shared by all Slack clients
         """
-        self.client = WebClient(token=token)
+        self.client = WebClient(token=token, ssl=ssl_context or _get_shared_ssl_context())
         self.channel = channel
         self.user_id = user_id
         self._channel_id = None  # Cached channel ID after resolution
@@ -66,6 +66,7 @@ class UpstreamServerConfig(BaseModel):
     url: Optional[str] = Field(None, description="URL for upstream server (HTTP/SSE)")
     transport: str = Field("stdio", description="Transport type: stdio, http, or sse")
     headers: Dict[str, str] = Field(default_factory=dict, description="HTTP headers for remote servers")
+    timeout_seconds: float = Field(60.0, description="How long to wait for a response to a request")
 
     @field_validator("transport")
     @classmethod
@@ -90,6 +91,17 @@ class Settings(BaseModel):
     enable_teams: bool = Field(False, description="Enable Microsoft Teams integration")
     use_local_approval: bool = Field(True, description="Enable local approval (GUI/file-based)")
     use_gui_approval: bool = Field(True, description="Use GUI dialog for local approval (requires tkinter)")
+    cached_tools: List[str] = Field(
+        default_factory=list, description="Idempotent upstream tools whose results may be reused"
+    )
+    cache_read_only_tools: bool = Field(
+        False, description="Also cache tools the upstream annotates with readOnlyHint"
+    )
+    tool_cache_ttl_seconds: float = Field(30.0, description="How long a cached tool result stays valid")
+    tool_cache_size: int = Field(256, description="Maximum number of cached tool results")
+    progressive_disclosure: bool = Field(
+        False, description="Expose upstream tools via discover_tools/get_schema/invoke"
+    )
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -197,6 +209,7 @@ class Settings(BaseModel):
                 url=upstream_url,
                 transport=upstream_transport,
                 headers=upstream_headers,
+                timeout_seconds=float(os.getenv("UPSTREAM_TIMEOUT_SECONDS", "60")),
             )
 
         # Approval settings
@@ -207,6 +220,14 @@ class Settings(BaseModel):
         use_local_approval = os.getenv("USE_LOCAL_APPROVAL", "true").lower() == "true"
         use_gui_approval = os.getenv("USE_GUI_APPROVAL", "true").lower() == "true"
 
+        # Upstream result caching
+        cached_tools_str = os.getenv("CACHED_TOOLS", "")
+        cached_tools = [t.strip() for t in cached_tools_str.split(",") if t.strip()] if cached_tools_str else []
+        cache_read_only_tools = os.getenv("CACHE_READ_ONLY_TOOLS", "false").lower() == "true"
+        tool_cache_ttl = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "30"))
+        tool_cache_size = int(os.getenv("TOOL_CACHE_SIZE", "256"))
+        progressive_disclosure = os.getenv("PROGRESSIVE_DISCLOSURE", "false").lower() == "true"
+
         return cls(
             slack=slack_config,
             webex=webex_config,
@@ -219,6 +240,11 @@ class Settings(BaseModel):
             enable_teams=enable_teams,
             use_local_approval=use_local_approval,
             use_gui_approval=use_gui_approval,
+            cached_tools=cached_tools,
+            cache_read_only_tools=cache_read_only_tools,
+            tool_cache_ttl_seconds=tool_cache_ttl,
+            tool_cache_size=tool_cache_size,
+            progressive_disclosure=progressive_disclosure,
         )
 
 
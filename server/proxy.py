@@ -1,18 +1,30 @@
 """FastMCP proxy server with middleware integration."""
 
 import asyncio
+import functools
+import hashlib
+import itertools
 import json
 import os
+import re
 import subprocess
 import sys
-import types
-from typing import Any, Dict, Optional, Union
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 import httpx
+import jsonschema
 from fastmcp import FastMCP
+from fastmcp.tools.tool import Tool, ToolResult
+from mcp.types import Tool as MCPTool
+from pydantic import Field
 
 from cite_before_act.approval import ApprovalManager
-from cite_before_act.debug import debug_log
+from cite_before_act.debug import debug_log, is_debug_enabled
 from cite_before_act.detection import DetectionEngine
 from cite_before_act.explain import ExplainEngine
 from cite_before_act.local_approval import LocalApproval
@@ -20,6 +32,9 @@ from cite_before_act.middleware import Middleware
 from cite_before_act.slack.client import SlackClient
 from cite_before_act.slack.handlers import SlackHandler
 from config.settings import Settings
+from server.tool_index import ToolSearchIndex
+
+__all__ = ["ProxyServer"]
 
 # Optional platform imports
 try:
@@ -29,6 +44,18 @@ except ImportError:
     WebexClient = None
     WebexHandler = None
 
+# Optional fast JSON codec; older releases are ignored rather than half-supported
+try:
+    import orjson
+
+    try:
+        if tuple(int(part) for part in orjson.__version__.split(".")[:2]) < (3, 9):
+            orjson = None
+    except (AttributeError, ValueError):
+        orjson = None
+except ImportError:
+    orjson = None
+
 try:
     from cite_before_act.teams.client import TeamsClient
     from cite_before_act.teams.handlers import TeamsHandler
@@ -43,6 +70,540 @@ except ImportError:
 # Will be updated from negotiated version in initialize response
 MCP_PROTOCOL_VERSION = "2025-06-18"
 
+# Static handshake messages shared by every transport
+_INITIALIZED_NOTIFICATION: Dict[str, Any] = {
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized",
+}
+_LIST_TOOLS_REQUEST: Dict[str, Any] = {
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list",
+    "params": {},
+}
+
+# Minimum seconds between tools/list refreshes triggered by unknown tool names
+_TOOLS_REFRESH_INTERVAL = 60.0
+# Seconds a tool name confirmed unknown is rejected without asking upstream again
+_UNKNOWN_TOOL_TTL = 30.0
+# Bound on remembered unknown names, so probing arbitrary names cannot grow it forever
+_UNKNOWN_TOOLS_MAX = 1024
+
+# Types whose values may arrive as strings and need converting
+_COERCED_JSON_TYPES = frozenset({"integer", "number", "boolean"})
+# Marks an argument the client did not send at all
+_MISSING = object()
+
+
+def _coerce_argument(value: Any, param_type: str) -> Any:
+    """Convert a tool argument to the type declared in the tool's JSON schema.
+
+    Args:
+        value: Argument value as received from the client
+        param_type: JSON schema type of the parameter
+
+    Returns:
+        Converted value (strings like "1" or "true" become int/bool)
+    """
+    if param_type == "integer":
+        return int(value) if isinstance(value, str) else value
+    if param_type == "number":
+        return float(value) if isinstance(value, str) else value
+    if param_type == "boolean":
+        if isinstance(value, str):
+            return value.lower() in ("true", "1", "yes")
+        return bool(value)
+    # String, array, object - pass through as-is
+    return value
+
+
+def _check_arguments(spec: "_ToolSpec", arguments: Any, validator: Any) -> None:
+    """Check call arguments against an upstream tool's input schema.
+
+    Values are checked after the same string conversion the call handler applies,
+    so "7" for an integer parameter is accepted.
+
+    Args:
+        spec: Parsed definition of the upstream tool
+        arguments: Arguments received from the client
+        validator: jsonschema validator built for spec.input_schema
+
+    Raises:
+        ValueError: If arguments are missing, unknown, or do not match the schema
+    """
+    if not isinstance(arguments, dict):
+        raise ValueError(f"Arguments for tool '{spec.name}' must be an object")
+    missing = sorted(spec.required.difference(arguments))
+    if missing:
+        raise ValueError(f"Missing required arguments for tool '{spec.name}': {', '.join(missing)}")
+    if not spec.extra_arguments:
+        declared = {name for name, _ in spec.param_types}
+        unknown = sorted(name for name in arguments if name not in declared)
+        if unknown:
+            raise ValueError(f"Unknown arguments for tool '{spec.name}': {', '.join(unknown)}")
+
+    param_types = dict(spec.param_types)
+    coerced = {}
+    for name, value in arguments.items():
+        param_type = param_types.get(name)
+        if value is not None and param_type is not None:
+            try:
+                value = _coerce_argument(value, param_type)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"Invalid arguments for tool '{spec.name}' at {name}: "
+                    f"{value!r} is not of type '{param_type}'"
+                ) from None
+        coerced[name] = value
+    try:
+        error = jsonschema.exceptions.best_match(validator.iter_errors(coerced))
+    except jsonschema.exceptions.SchemaError as e:
+        # A malformed upstream schema can't be enforced; let the upstream server decide
+        debug_log("Skipping argument validation for tool '{}': {}", spec.name, e)
+        return
+    if error is not None:
+        location = "/".join(str(part) for part in error.absolute_path) or "arguments"
+        raise ValueError(f"Invalid arguments for tool '{spec.name}' at {location}: {error.message}")
+
+
+# Schema annotations that only document the schema and can be dropped before listing
+_SCHEMA_NOISE_KEYS = frozenset({"title", "examples", "$comment"})
+# Keywords whose value maps names to subschemas, rather than being a subschema
+_SCHEMA_MAP_KEYS = frozenset({"properties", "patternProperties", "$defs", "definitions"})
+# Keywords whose value is literal data and must not be rewritten
+_SCHEMA_LITERAL_KEYS = frozenset({"enum", "const", "default", "required"})
+
+
+def _minify_schema(schema: Any) -> Any:
+    """Strip documentation-only keywords from a JSON schema.
+
+    Removes "title", "examples" and "$comment" wherever they appear as schema
+    keywords (never as property names or inside literal values) and collapses
+    single-entry "allOf" wrappers.
+
+    Args:
+        schema: JSON schema, or a nested part of one
+
+    Returns:
+        Minified copy of the schema
+    """
+    if isinstance(schema, list):
+        return [_minify_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+
+    minified: Dict[str, Any] = {}
+    for key, value in schema.items():
+        if key in _SCHEMA_NOISE_KEYS:
+            continue
+        if key in _SCHEMA_LITERAL_KEYS:
+            minified[key] = value
+        elif key in _SCHEMA_MAP_KEYS and isinstance(value, dict):
+            minified[key] = {name: _minify_schema(subschema) for name, subschema in value.items()}
+        else:
+            minified[key] = _minify_schema(value)
+
+    all_of = minified.get("allOf")
+    if isinstance(all_of, list) and len(all_of) == 1 and isinstance(all_of[0], dict):
+        only = all_of[0]
+        if not (only.keys() & (minified.keys() - {"allOf"})):
+            del minified["allOf"]
+            minified.update(only)
+    return minified
+
+
+def _resolve_local_ref(prop: Any, root_schema: Dict[str, Any]) -> Any:
+    """Follow a local "$ref" (e.g. "#/$defs/Mode") within a tool's input schema.
+
+    Args:
+        prop: Property schema, possibly a reference
+        root_schema: Input schema the reference is relative to
+
+    Returns:
+        Referenced schema, or the property unchanged if it is not a resolvable local ref
+    """
+    if not isinstance(prop, dict):
+        return prop
+    ref = prop.get("$ref")
+    if not isinstance(ref, str) or not ref.startswith("#/"):
+        return prop
+    target: Any = root_schema
+    for part in ref[2:].split("/"):
+        if not isinstance(target, dict) or part not in target:
+            return prop
+        target = target[part]
+    return target
+
+
+# Subschemas smaller than this (encoded) are not worth looking up for sharing
+_SHARED_SCHEMA_MIN_BYTES = 200
+
+
+def _share_schema_nodes(node: Any, shared: Dict[bytes, Any]) -> Any:
+    """Replace subschemas with identical ones already seen in other tools.
+
+    Upstream servers often repeat the same sub-schemas (pagination envelopes,
+    common option objects) across many tools. Structurally equal subtrees are
+    collapsed onto a single shared object, so each is held in memory once. The
+    schemas are unchanged as JSON, so tools/list responses and "$ref"
+    resolution by clients are unaffected. Shared nodes must not be mutated.
+
+    Args:
+        node: JSON schema, or a nested part of one
+        shared: Registry of shared subschemas keyed by their canonical encoding
+
+    Returns:
+        The node, or an equal shared node already in the registry
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, (dict, list)):
+                node[key] = _share_schema_nodes(value, shared)
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            if isinstance(value, (dict, list)):
+                node[index] = _share_schema_nodes(value, shared)
+    else:
+        return node
+
+    if not isinstance(node, dict):
+        return node
+    encoded = _json_dumps(node, sort_keys=True)
+    if len(encoded) < _SHARED_SCHEMA_MIN_BYTES:
+        return node
+    return shared.setdefault(hashlib.blake2b(encoded, digest_size=16).digest(), node)
+
+
+@dataclass(frozen=True, slots=True)
+class _ToolSpec:
+    """Upstream tool definition with its input schema pre-digested for calls."""
+
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    param_types: Tuple[Tuple[str, str], ...]  # (parameter name, JSON schema type)
+    required: FrozenSet[str]
+    read_only: bool  # Upstream annotated the tool with readOnlyHint
+    extra_arguments: bool  # Schema explicitly allows undeclared arguments (additionalProperties)
+
+    @classmethod
+    def from_tool(cls, tool: Dict[str, Any]) -> "_ToolSpec":
+        """Build a spec from a tools/list entry.
+
+        Args:
+            tool: Tool definition as returned by the upstream server
+
+        Returns:
+            Tool spec
+        """
+        input_schema = _minify_schema(tool.get("inputSchema") or {})
+        properties = input_schema.get("properties", {})
+        param_types = []
+        for param_name, prop in properties.items():
+            # Resolve references once here so calls never walk the schema
+            prop = _resolve_local_ref(prop, input_schema)
+            param_type = prop.get("type", "string") if isinstance(prop, dict) else "string"
+            if not isinstance(param_type, str):
+                # Union types like ["integer", "null"] are passed through unconverted
+                param_type = "string"
+            param_types.append((param_name, param_type))
+        return cls(
+            name=sys.intern(tool["name"]),
+            description=tool.get("description", ""),
+            input_schema=input_schema,
+            param_types=tuple(param_types),
+            required=frozenset(input_schema.get("required", [])),
+            read_only=(tool.get("annotations") or {}).get("readOnlyHint") is True,
+            extra_arguments=input_schema.get("additionalProperties", False) is not False,
+        )
+
+
+def _json_dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Encode a value as compact JSON bytes, using orjson when it is installed.
+
+    Args:
+        value: JSON-serializable value
+        sort_keys: Sort object keys, for canonical encodings used as cache keys
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except TypeError:
+            pass  # e.g. non-string keys or out-of-range ints; the stdlib handles these
+    return json.dumps(value, separators=(",", ":"), sort_keys=sort_keys).encode("utf-8")
+
+
+def _json_loads(data: Any) -> Any:
+    """Decode JSON, using orjson when it is installed.
+
+    orjson is stricter than the stdlib: it rejects NaN/Infinity and integers
+    wider than 64 bits. Such input is decoded again with json.loads rather than
+    failing, so callers only ever see json.JSONDecodeError for invalid JSON.
+
+    Args:
+        data: JSON document as str or bytes
+
+    Returns:
+        Decoded value
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a JSON-RPC message as a newline-terminated line for the stdio pipe.
+
+    The MCP stdio transport frames messages as newline-delimited JSON. Newlines
+    inside string values are always escaped by the encoder, so a raw newline can
+    only ever mark the end of a message.
+    """
+    return _json_dumps(message) + b"\n"
+
+
+# Integer "id" members in a raw response line, used to find the owner of a line
+# that fails to parse
+_RESPONSE_ID_PATTERN = re.compile(rb'"id"\s*:\s*(\d+)')
+
+# Static handshake messages, pre-encoded for the stdio pipe
+_INITIALIZED_NOTIFICATION_LINE = _encode_message(_INITIALIZED_NOTIFICATION)
+_LIST_TOOLS_REQUEST_LINE = _encode_message(_LIST_TOOLS_REQUEST)
+
+
+class _PipeLineReader:
+    """Newline-delimited reader over a raw pipe file descriptor.
+
+    Async reads wait for readiness on the running event loop instead of parking
+    a blocking readline in the default executor. Blocking reads share the same
+    buffer, so bytes read ahead during the handshake are not lost when the
+    background reader thread takes over.
+    """
+
+    _CHUNK_SIZE = 65536
+
+    def __init__(self, fd: int):
+        """Initialize the reader.
+
+        Args:
+            fd: Readable pipe file descriptor
+        """
+        self._fd = fd
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _pop_line(self) -> Optional[bytes]:
+        """Remove and return the next complete line from the buffer, if any."""
+        end = self._buffer.find(b"\n")
+        if end < 0:
+            return None
+        line = bytes(self._buffer[:end + 1])
+        del self._buffer[:end + 1]
+        return line
+
+    def _fill(self) -> None:
+        """Read whatever is available from the pipe into the buffer."""
+        try:
+            chunk = os.read(self._fd, self._CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if chunk:
+            self._buffer += chunk
+        else:
+            self._eof = True
+
+    def _take_line(self) -> Optional[bytes]:
+        """Return the next line, the unterminated tail at EOF, or None if more data is needed."""
+        line = self._pop_line()
+        if line is None and self._eof:
+            line = bytes(self._buffer)
+            self._buffer.clear()
+        return line
+
+    def read_line_blocking(self) -> bytes:
+        """Read the next line, blocking the calling thread.
+
+        Returns:
+            Line including its newline, or b"" at EOF
+        """
+        line = self._take_line()
+        while line is None:
+            self._fill()
+            line = self._take_line()
+        return line
+
+    def read_lines_blocking(self) -> List[bytes]:
+        """Read every complete line available, blocking until there is at least one.
+
+        Returns:
+            Lines including their newlines, or an empty list at EOF
+        """
+        while True:
+            end = self._buffer.rfind(b"\n")
+            if end >= 0:
+                block = bytes(self._buffer[:end + 1])
+                del self._buffer[:end + 1]
+                return block.splitlines(keepends=True)
+            if self._eof:
+                tail = bytes(self._buffer)
+                self._buffer.clear()
+                return [tail] if tail else []
+            self._fill()
+
+    async def read_line(self) -> bytes:
+        """Read the next line without blocking the event loop.
+
+        Returns:
+            Line including its newline, or b"" at EOF
+        """
+        line = self._take_line()
+        if line is not None:
+            return line
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def on_readable() -> None:
+            # The pipe is readable, so this os.read returns without blocking
+            self._fill()
+            ready = self._take_line()
+            if ready is not None:
+                _set_future_result(future, ready)
+
+        try:
+            loop.add_reader(self._fd, on_readable)
+        except NotImplementedError:
+            # Proactor loops (Windows) cannot watch pipes; fall back to a worker thread
+            return await loop.run_in_executor(None, self.read_line_blocking)
+        try:
+            return await future
+        finally:
+            loop.remove_reader(self._fd)
+
+
+def _terminate_process(process: subprocess.Popen) -> None:
+    """Terminate an upstream process, escalating to kill if it does not exit promptly."""
+    if process.poll() is not None:
+        return
+    try:
+        process.terminate()
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    except OSError:
+        pass
+
+
+def _set_future_result(future: asyncio.Future, result: Any) -> None:
+    """Resolve a future unless it was already cancelled or resolved."""
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_results(batch: List[Tuple[asyncio.Future, Any]]) -> None:
+    """Resolve several futures from one event loop callback."""
+    for future, result in batch:
+        _set_future_result(future, result)
+
+
+def _set_future_exception(future: asyncio.Future, exc: BaseException) -> None:
+    """Fail a future unless it was already cancelled or resolved."""
+    if not future.done():
+        future.set_exception(exc)
+
+
+def _to_tool_result(result: Any) -> ToolResult:
+    """Wrap an upstream result (content list or result structure) for FastMCP."""
+    if isinstance(result, dict):
+        return ToolResult(content=result, structured_content=result)
+    return ToolResult(content=result if result is not None else [])
+
+
+def _summarize_description(description: str) -> str:
+    """Shorten a tool description to its first sentence for discovery listings."""
+    first_sentence = description.strip().split(". ", 1)[0].split("\n", 1)[0]
+    return first_sentence.rstrip(".")
+
+
+class UpstreamTool(Tool):
+    """FastMCP tool that stands in for a single upstream tool.
+
+    Listing uses the upstream input schema as-is, so registering a tool does not
+    build a Python function or pydantic model for it. Calls are routed back to
+    the proxy, which creates the call handler on first use.
+    """
+
+    proxy: Any = Field(exclude=True)
+
+    async def run(self, arguments: Dict[str, Any]) -> ToolResult:
+        """Forward the call to the proxy and wrap the upstream result."""
+        result = await self.proxy._dispatch_tool_call(self.name, arguments)
+        return _to_tool_result(result)
+
+
+class _ProxyFastMCP(FastMCP):
+    """FastMCP server that keeps its tools/list result between requests.
+
+    FastMCP rebuilds every listed tool from its registry on each tools/list.
+    The proxy's tool set only changes when tools are added or removed, so the
+    converted listing is kept until then.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._listed_tools: Optional[List[MCPTool]] = None
+
+    async def _mcp_list_tools(self) -> List[MCPTool]:
+        if self._listed_tools is None:
+            self._listed_tools = await super()._mcp_list_tools()
+        return list(self._listed_tools)
+
+    def add_tool(self, tool: Tool) -> Tool:
+        self._listed_tools = None
+        return super().add_tool(tool)
+
+    def remove_tool(self, name: str) -> None:
+        self._listed_tools = None
+        super().remove_tool(name)
+
+    def add_tools(self, tools: List[Tool]) -> None:
+        """Register several tools at once, before the server starts.
+
+        FastMCP.add_tool looks for a request context to send a list-changed
+        notification on every call. At startup there is none, so the tools are
+        put straight into the tool manager's registry in one update, falling
+        back to add_tool if the registry is not where it is expected. A tool
+        whose name is already registered (e.g. an upstream tool named
+        "explain") goes through add_tool, so the duplicate is warned about
+        or handled per the server's on_duplicate_tools setting.
+
+        Args:
+            tools: Tools to register
+        """
+        self._listed_tools = None
+        registry = getattr(getattr(self, "_tool_manager", None), "_tools", None)
+        if not isinstance(registry, dict):
+            for tool in tools:
+                super().add_tool(tool)
+            return
+        new_tools = {}
+        duplicates = []
+        for tool in tools:
+            if tool.key in registry or tool.key in new_tools:
+                duplicates.append(tool)
+            else:
+                new_tools[tool.key] = tool
+        registry.update(new_tools)
+        for tool in duplicates:
+            super().add_tool(tool)
+
 
 class ProxyServer:
     """FastMCP proxy server that wraps upstream servers with approval middleware."""
@@ -60,10 +621,32 @@ class ProxyServer:
         self.upstream_http_client: Optional[httpx.AsyncClient] = None
         self.upstream_messages_url: Optional[str] = None  # For SSE transport
         self.upstream_sse_stream: Optional[httpx.AsyncClient] = None  # SSE event stream
-        self.upstream_pending_responses: Dict[int, asyncio.Future] = {}  # Request ID -> Future for SSE
+        self.upstream_pending_responses: Dict[int, asyncio.Future] = {}  # Request ID -> Future (stdio/SSE)
         self.upstream_sse_task: Optional[asyncio.Task] = None  # Background task for SSE events
+        self.upstream_reader_thread: Optional[threading.Thread] = None  # stdio response reader
+        self._upstream_stdout: Optional[_PipeLineReader] = None
+        self._upstream_closed = False  # Set once the stdio reader sees EOF
         self.upstream_tools: Dict[str, Dict[str, Any]] = {}
-        self._request_id = 3  # Start after init and list_tools
+        self._tool_specs: Dict[str, _ToolSpec] = {}  # Tool name -> parsed schema, built once per listing
+        self._tool_summaries: Optional[List[Dict[str, str]]] = None  # discover_tools listing
+        self._tool_index: Optional[ToolSearchIndex] = None  # discover_tools search, built on first query
+        self._tools_listed_at = 0.0  # Monotonic time of the last tools/list
+        self._unknown_tools: Dict[Any, float] = {}  # Tool name -> monotonic time the miss expires
+        self._tool_handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+        self._argument_validators: Dict[str, Any] = {}  # Tool name -> jsonschema validator
+        self._call_prefixes: Dict[str, bytes] = {}  # Tool name -> encoded tools/call prefix
+        self._upstream_stdin_fd: Optional[int] = None  # Set when writes can bypass stdin buffering
+        self._upstream_finalizer: Optional[weakref.finalize] = None
+        self._cached_tools = frozenset(settings.cached_tools)
+        # Built from the tool listing; mutating tools never enter either set
+        self._cacheable_tools: FrozenSet[str] = frozenset()  # Results may be reused
+        self._side_effect_free_tools: FrozenSet[str] = frozenset()  # Calls leave the cache valid
+        # Canonical encoding digest -> subschema shared across tools (see _share_schema_nodes)
+        self._shared_schema_nodes: Dict[bytes, Any] = {}
+        self._result_cache: "OrderedDict[Tuple[str, bytes], Tuple[float, Any]]" = OrderedDict()
+        self._result_cache_generation = 0  # Bumped whenever the cache is invalidated
+        self._explain_canonical = functools.lru_cache(maxsize=1024)(self._explain_uncached)
+        self._request_ids = itertools.count(3)  # Start after init and list_tools
         self.mcp_protocol_version: str = MCP_PROTOCOL_VERSION  # Negotiated protocol version
 
         # Initialize components
@@ -225,6 +808,148 @@ class ProxyServer:
             approval_manager=approval_manager,
         )
 
+    def _build_initialize_request(self) -> Dict[str, Any]:
+        """Build the MCP initialize request sent to the upstream server.
+
+        Returns:
+            JSON-RPC initialize request
+        """
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": self.mcp_protocol_version,
+                "capabilities": {},
+                "clientInfo": {"name": "cite-before-act-proxy", "version": "0.1.0"},
+            },
+        }
+
+    def _apply_initialize_response(self, init_response: Dict[str, Any]) -> None:
+        """Validate the upstream initialize response and record the negotiated protocol version.
+
+        Args:
+            init_response: JSON-RPC response to the initialize request
+
+        Raises:
+            RuntimeError: If the upstream server reported an error
+        """
+        if "error" in init_response:
+            raise RuntimeError(f"Upstream server initialization failed: {init_response['error']}")
+
+        # Extract negotiated protocol version from response
+        if "result" in init_response and "protocolVersion" in init_response["result"]:
+            self.mcp_protocol_version = init_response["result"]["protocolVersion"]
+            debug_log("Negotiated MCP protocol version: {}", self.mcp_protocol_version)
+
+    def _store_upstream_tools(self, tools_response: Dict[str, Any]) -> List[str]:
+        """Record the tools listed in an upstream tools/list response.
+
+        Args:
+            tools_response: JSON-RPC response to the tools/list request
+
+        Returns:
+            Names of tools that were not known before
+        """
+        self._tools_listed_at = time.monotonic()
+        new_tools = []
+        if "result" in tools_response and "tools" in tools_response["result"]:
+            self._tool_summaries = None
+            self._tool_index = None
+            self._shared_schema_nodes = {}
+            self._unknown_tools.clear()
+            for tool in tools_response["result"]["tools"]:
+                spec = _ToolSpec.from_tool(tool)
+                _share_schema_nodes(spec.input_schema, self._shared_schema_nodes)
+                if spec.name not in self._tool_specs:
+                    new_tools.append(spec.name)
+                # A re-listed tool may have a new schema; rebuild its handler on next use
+                self._tool_handlers.pop(spec.name, None)
+                self._argument_validators.pop(spec.name, None)
+                self._tool_specs[spec.name] = spec
+                self.upstream_tools[spec.name] = {
+                    "name": spec.name,
+                    "description": spec.description,
+                    "inputSchema": spec.input_schema,
+                }
+            self._classify_cacheable_tools()
+        return new_tools
+
+    def _classify_cacheable_tools(self) -> None:
+        """Decide which listed tools may be served from, or leave intact, the result cache.
+
+        A tool that detection treats as mutating is never cached, even when it is
+        listed in CACHED_TOOLS or annotated readOnlyHint: an approved call must
+        actually reach the upstream server.
+        """
+        detection_engine = self.middleware.detection_engine if self.middleware else None
+        cacheable = set()
+        side_effect_free = set()
+        for spec in self._tool_specs.values():
+            if detection_engine is not None and detection_engine.is_mutating(
+                tool_name=spec.name,
+                tool_description=spec.description,
+                tool_schema=spec.input_schema,
+            ):
+                if spec.name in self._cached_tools:
+                    print(
+                        f"Warning: '{spec.name}' is in CACHED_TOOLS but requires approval; "
+                        "its results will not be cached",
+                        file=sys.stderr,
+                    )
+                continue
+            if spec.name in self._cached_tools or (spec.read_only and self.settings.cache_read_only_tools):
+                cacheable.add(spec.name)
+            if spec.read_only:
+                side_effect_free.add(spec.name)
+        self._cacheable_tools = frozenset(cacheable)
+        self._side_effect_free_tools = frozenset(side_effect_free | cacheable)
+
+    async def _refresh_tools(self) -> None:
+        """Re-list tools from the already running upstream connection.
+
+        Rate-limited to one tools/list per _TOOLS_REFRESH_INTERVAL. Only the tool list
+        is fetched; the connection itself is not re-initialized.
+        """
+        if time.monotonic() - self._tools_listed_at < _TOOLS_REFRESH_INTERVAL:
+            return
+        self._tools_listed_at = time.monotonic()
+
+        request_id = next(self._request_ids)
+        request_body = _encode_message({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/list",
+            "params": {},
+        })
+        tools_response = await self._send_upstream_request(request_id, request_body, "tools/list")
+        new_tools = self._store_upstream_tools(tools_response)
+        debug_log("Refreshed upstream tools, new: {}", new_tools)
+
+        if self.mcp and not self.settings.progressive_disclosure:
+            for tool_name in new_tools:
+                self._add_upstream_tool(self._tool_specs[tool_name])
+
+    async def _ensure_tool(self, tool_name: Any) -> None:
+        """Make sure a tool exists upstream, re-listing tools once if it is not known yet.
+
+        Args:
+            tool_name: Tool name requested by the client
+
+        Raises:
+            ValueError: If the upstream server does not have the tool
+        """
+        if tool_name in self._tool_specs:
+            return
+        if self._unknown_tools.get(tool_name, 0.0) > time.monotonic():
+            raise ValueError(f"Unknown tool: {tool_name}")
+        await self._refresh_tools()
+        if tool_name not in self._tool_specs:
+            if len(self._unknown_tools) >= _UNKNOWN_TOOLS_MAX:
+                self._unknown_tools.clear()
+            self._unknown_tools[tool_name] = time.monotonic() + _UNKNOWN_TOOL_TTL
+            raise ValueError(f"Unknown tool: {tool_name}")
+
     async def _connect_to_upstream(self) -> None:
         """Connect to the upstream MCP server and fetch its tools."""
         if not self.settings.upstream:
@@ -248,48 +973,45 @@ class ProxyServer:
                 if key.startswith("GITHUB_"):
                     upstream_env[key] = value
             
-            # Start upstream server as subprocess
-            self.upstream_process = subprocess.Popen(
-                [upstream_config.command] + upstream_config.args,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=0,
-                env=upstream_env,
+            # Start upstream server as subprocess. The spawn (fork/exec) runs in a
+            # worker thread so it never stalls the event loop. A plain Popen is kept
+            # rather than an asyncio subprocess because the proxy works on the raw
+            # pipe descriptors: requests go out with os.writev and responses are
+            # read by the reader thread started below, neither of which an asyncio
+            # subprocess transport exposes.
+            loop = asyncio.get_running_loop()
+            self.upstream_process = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    subprocess.Popen,
+                    [upstream_config.command] + upstream_config.args,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=upstream_env,
+                ),
             )
+            # Make sure the upstream process never outlives this proxy
+            self._upstream_finalizer = weakref.finalize(
+                self, _terminate_process, self.upstream_process
+            )
+            if hasattr(os, "writev"):
+                self._upstream_stdin_fd = self.upstream_process.stdin.fileno()
+            self._upstream_stdout = _PipeLineReader(self.upstream_process.stdout.fileno())
 
             # Initialize MCP connection
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": self.mcp_protocol_version,
-                    "capabilities": {},
-                    "clientInfo": {"name": "cite-before-act-proxy", "version": "0.1.0"},
-                },
-            }
+            init_request = self._build_initialize_request()
 
             # Send initialize request
-            request_str = json.dumps(init_request) + "\n"
-            self.upstream_process.stdin.write(request_str)
-            self.upstream_process.stdin.flush()
+            self._write_upstream(_encode_message(init_request))
 
             # Read initialize response asynchronously
-            loop = asyncio.get_event_loop()
-            response_line = await loop.run_in_executor(
-                None, self.upstream_process.stdout.readline
-            )
+            response_line = await self._upstream_stdout.read_line()
             if not response_line:
                 # Check if process has exited
                 if self.upstream_process.poll() is not None:
                     # Process has exited, try to read stderr
-                    stderr_output = ""
-                    try:
-                        stderr_output = self.upstream_process.stderr.read(1024) if self.upstream_process.stderr else ""
-                    except Exception:
-                        pass
+                    stderr_output = self._read_upstream_stderr()
                     
                     error_msg = f"Upstream server process exited with code {self.upstream_process.returncode}"
                     if stderr_output:
@@ -299,61 +1021,39 @@ class ProxyServer:
                     raise RuntimeError("Upstream server did not respond to initialize request")
             
             try:
-                init_response = json.loads(response_line.strip())
+                init_response = _json_loads(response_line)
             except json.JSONDecodeError as e:
                 # Check if process has exited
                 stderr_output = ""
                 if self.upstream_process.poll() is not None:
-                    try:
-                        stderr_output = self.upstream_process.stderr.read(1024) if self.upstream_process.stderr else ""
-                    except Exception:
-                        pass
+                    stderr_output = self._read_upstream_stderr()
                 
-                error_msg = f"Failed to parse upstream server response: {e}\nReceived: {response_line[:200]}"
+                received = response_line[:200].decode("utf-8", errors="replace")
+                error_msg = f"Failed to parse upstream server response: {e}\nReceived: {received}"
                 if stderr_output:
                     error_msg += f"\nStderr output: {stderr_output}"
                 raise RuntimeError(error_msg)
             
-            if "error" in init_response:
-                raise RuntimeError(f"Upstream server initialization failed: {init_response['error']}")
-
-            # Extract negotiated protocol version from response
-            if "result" in init_response and "protocolVersion" in init_response["result"]:
-                self.mcp_protocol_version = init_response["result"]["protocolVersion"]
-                debug_log("Negotiated MCP protocol version: {}", self.mcp_protocol_version)
-
-            # Send initialized notification
-            initialized_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized",
-            }
-            self.upstream_process.stdin.write(json.dumps(initialized_notification) + "\n")
-            self.upstream_process.stdin.flush()
+            self._apply_initialize_response(init_response)
 
-            # List tools from upstream server
-            list_tools_request = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {},
-            }
-            self.upstream_process.stdin.write(json.dumps(list_tools_request) + "\n")
-            self.upstream_process.stdin.flush()
+            # Send initialized notification and pipeline tools/list right
+            # behind it in a single write
+            self._write_upstream(_INITIALIZED_NOTIFICATION_LINE, _LIST_TOOLS_REQUEST_LINE)
 
             # Read tools list response asynchronously
-            loop = asyncio.get_event_loop()
-            tools_response_line = await loop.run_in_executor(
-                None, self.upstream_process.stdout.readline
-            )
+            tools_response_line = await self._upstream_stdout.read_line()
             if tools_response_line:
-                tools_response = json.loads(tools_response_line.strip())
-                if "result" in tools_response and "tools" in tools_response["result"]:
-                    for tool in tools_response["result"]["tools"]:
-                        self.upstream_tools[tool["name"]] = {
-                            "name": tool["name"],
-                            "description": tool.get("description", ""),
-                            "inputSchema": tool.get("inputSchema", {}),
-                        }
+                tools_response = _json_loads(tools_response_line)
+                self._store_upstream_tools(tools_response)
+
+            # Handshake is done; from here on a single reader demultiplexes
+            # responses by request ID so concurrent tool calls can overlap
+            self.upstream_reader_thread = threading.Thread(
+                target=self._read_stdio_responses,
+                name="upstream-stdio-reader",
+                daemon=True,
+            )
+            self.upstream_reader_thread.start()
 
         elif upstream_config.transport in ("http", "sse") and upstream_config.url:
             # HTTP/SSE transport for remote MCP servers
@@ -410,16 +1110,7 @@ class ProxyServer:
                 )
                 
                 # Initialize MCP connection via POST to /messages
-                init_request = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": self.mcp_protocol_version,
-                        "capabilities": {},
-                        "clientInfo": {"name": "cite-before-act-proxy", "version": "0.1.0"},
-                    },
-                }
+                init_request = self._build_initialize_request()
                 
                 # For SSE, send requests via POST and wait for responses via SSE stream
                 # Send initialize request
@@ -461,23 +1152,13 @@ class ProxyServer:
                 finally:
                     self.upstream_pending_responses.pop(1, None)
                 
-                if "error" in init_response:
-                    raise RuntimeError(f"Upstream server initialization failed: {init_response['error']}")
-                
-                # Extract negotiated protocol version from response
-                if "result" in init_response and "protocolVersion" in init_response["result"]:
-                    self.mcp_protocol_version = init_response["result"]["protocolVersion"]
-                    debug_log("Negotiated MCP protocol version: {}", self.mcp_protocol_version)
+                self._apply_initialize_response(init_response)
                 
                 # Send initialized notification (fire and forget)
-                initialized_notification = {
-                    "jsonrpc": "2.0",
-                    "method": "notifications/initialized",
-                }
                 try:
                     await self.upstream_http_client.post(
                         messages_url,
-                        json=initialized_notification,
+                        json=_INITIALIZED_NOTIFICATION,
                         headers=post_headers,
                     )
                 except httpx.HTTPError:
@@ -485,20 +1166,13 @@ class ProxyServer:
                     pass
                 
                 # List tools from upstream server
-                list_tools_request = {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/list",
-                    "params": {},
-                }
-                
                 tools_future = asyncio.Future()
                 self.upstream_pending_responses[2] = tools_future
                 
                 try:
                     await self.upstream_http_client.post(
                         messages_url,
-                        json=list_tools_request,
+                        json=_LIST_TOOLS_REQUEST,
                         headers=post_headers,
                     )
                     tools_response = await asyncio.wait_for(tools_future, timeout=30.0)
@@ -509,13 +1183,7 @@ class ProxyServer:
                 finally:
                     self.upstream_pending_responses.pop(2, None)
                 
-                if "result" in tools_response and "tools" in tools_response["result"]:
-                    for tool in tools_response["result"]["tools"]:
-                        self.upstream_tools[tool["name"]] = {
-                            "name": tool["name"],
-                            "description": tool.get("description", ""),
-                            "inputSchema": tool.get("inputSchema", {}),
-                        }
+                self._store_upstream_tools(tools_response)
             else:
                 # HTTP POST transport (for servers that support direct HTTP POST)
                 # Build headers for HTTP client
@@ -538,16 +1206,7 @@ class ProxyServer:
                 self.upstream_messages_url = base_url
                 
                 # Initialize MCP connection
-                init_request = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": self.mcp_protocol_version,
-                        "capabilities": {},
-                        "clientInfo": {"name": "cite-before-act-proxy", "version": "0.1.0"},
-                    },
-                }
+                init_request = self._build_initialize_request()
                 
                 # Send initialize request to the exact URL provided
                 debug_log("Sending HTTP POST initialize request to: {}", base_url)
@@ -604,23 +1263,13 @@ class ProxyServer:
                 except json.JSONDecodeError as e:
                     raise RuntimeError(f"Invalid response from upstream server: {e}")
                 
-                if "error" in init_response:
-                    raise RuntimeError(f"Upstream server initialization failed: {init_response['error']}")
-                
-                # Extract negotiated protocol version from response
-                if "result" in init_response and "protocolVersion" in init_response["result"]:
-                    self.mcp_protocol_version = init_response["result"]["protocolVersion"]
-                    debug_log("Negotiated MCP protocol version: {}", self.mcp_protocol_version)
+                self._apply_initialize_response(init_response)
                 
                 # Send initialized notification
-                initialized_notification = {
-                    "jsonrpc": "2.0",
-                    "method": "notifications/initialized",
-                }
                 try:
                     await self.upstream_http_client.post(
                         base_url,
-                        json=initialized_notification,
+                        json=_INITIALIZED_NOTIFICATION,
                         headers=headers,
                     )
                 except httpx.HTTPError:
@@ -628,17 +1277,10 @@ class ProxyServer:
                     pass
                 
                 # List tools from upstream server
-                list_tools_request = {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/list",
-                    "params": {},
-                }
-                
                 try:
                     response = await self.upstream_http_client.post(
                         base_url,
-                        json=list_tools_request,
+                        json=_LIST_TOOLS_REQUEST,
                         headers=headers,
                     )
                     response.raise_for_status()
@@ -652,13 +1294,7 @@ class ProxyServer:
                 except json.JSONDecodeError as e:
                     raise RuntimeError(f"Invalid response from upstream server: {e}")
                 
-                if "result" in tools_response and "tools" in tools_response["result"]:
-                    for tool in tools_response["result"]["tools"]:
-                        self.upstream_tools[tool["name"]] = {
-                            "name": tool["name"],
-                            "description": tool.get("description", ""),
-                            "inputSchema": tool.get("inputSchema", {}),
-                        }
+                self._store_upstream_tools(tools_response)
                 
                 self.upstream_messages_url = None  # Use base URL for HTTP POST
         else:
@@ -667,7 +1303,7 @@ class ProxyServer:
     async def _setup_proxy_server(self) -> None:
         """Set up the FastMCP proxy server with upstream tools."""
         # Create FastMCP server
-        self.mcp = FastMCP("Cite-Before-Act MCP Proxy")
+        self.mcp = _ProxyFastMCP("Cite-Before-Act MCP Proxy")
 
         # Add explain tool
         @self.mcp.tool()
@@ -682,221 +1318,361 @@ class ProxyServer:
                 Human-readable description
             """
             if self.middleware:
-                return self.middleware.explain_engine.explain(
-                    tool_name=tool_name,
-                    arguments=arguments,
-                )
+                # Agents often preview the same call repeatedly; reuse the text
+                canonical_arguments = _json_dumps(arguments, sort_keys=True)
+                return self._explain_canonical(tool_name, canonical_arguments)
             return f"Would execute {tool_name} with arguments {arguments}"
 
-        # Dynamically create proxy tools for each upstream tool
-        for tool_name, tool_info in self.upstream_tools.items():
-            # Get the input schema to understand the parameters
-            input_schema = tool_info.get("inputSchema", {})
-            properties = input_schema.get("properties", {})
-            required_params = set(input_schema.get("required", []))
-            param_names = list(properties.keys())
-            
-            # Debug: Print schema info for troubleshooting
-            debug_log("Tool '{}' schema - required: {}, properties: {}", 
-                     tool_name, required_params, list(properties.keys()))
-            
-            # Capture variables in closure (before creating function)
-            name = tool_name
-            desc = tool_info.get("description", "")
-            schema = input_schema
-            middleware_ref = self.middleware
-            tools_ref = self.upstream_tools
-            
-            # Create a function with explicit parameters
-            # FastMCP requires explicit parameters, not **kwargs
-            # Make optional parameters have default values of None
-            if param_names:
-                # Build function signature with optional parameters having defaults
-                param_defs = []
-                for param_name in param_names:
-                    prop = properties.get(param_name, {})
-                    param_type = prop.get("type", "string")
-                    # Map JSON schema types to Python types
-                    if param_type == "integer" or param_type == "number":
-                        type_hint = "int" if param_type == "integer" else "float"
-                    elif param_type == "boolean":
-                        type_hint = "bool"
-                    elif param_type == "array":
-                        type_hint = "list"
-                    elif param_type == "object":
-                        type_hint = "dict"
-                    else:
-                        type_hint = "str"
-                    
-                    # Make parameter optional if not in required list
-                    if param_name not in required_params:
-                        param_defs.append(f"{param_name}: Optional[{type_hint}] = None")
-                    else:
-                        param_defs.append(f"{param_name}: {type_hint}")
-                
-                params_str = ", ".join(param_defs)
-                # Build code to collect and convert parameters into dict
-                # We need to convert string parameters to their correct types based on schema
-                collect_code = "arguments = {}\n"
-                # Convert and add all parameters (required and optional)
-                for p in param_names:
-                    prop = properties.get(p, {})
-                    param_type = prop.get("type", "string")
-                    var_name = p
-                    
-                    # Build conversion code based on type
-                    if param_type == "integer":
-                        # Convert to int (handle string "1" -> int 1)
-                        if p in required_params:
-                            collect_code += f"    arguments['{p}'] = int({var_name}) if isinstance({var_name}, str) else {var_name}\n"
-                        else:
-                            collect_code += f"    if {var_name} is not None:\n"
-                            collect_code += f"        arguments['{p}'] = int({var_name}) if isinstance({var_name}, str) else {var_name}\n"
-                    elif param_type == "number":
-                        # Convert to float (handle string "1.0" -> float 1.0)
-                        if p in required_params:
-                            collect_code += f"    arguments['{p}'] = float({var_name}) if isinstance({var_name}, str) else {var_name}\n"
-                        else:
-                            collect_code += f"    if {var_name} is not None:\n"
-                            collect_code += f"        arguments['{p}'] = float({var_name}) if isinstance({var_name}, str) else {var_name}\n"
-                    elif param_type == "boolean":
-                        # Convert to bool (handle string "true"/"false" -> bool)
-                        if p in required_params:
-                            collect_code += f"    if isinstance({var_name}, str):\n"
-                            collect_code += f"        arguments['{p}'] = {var_name}.lower() in ('true', '1', 'yes')\n"
-                            collect_code += f"    else:\n"
-                            collect_code += f"        arguments['{p}'] = bool({var_name})\n"
-                        else:
-                            collect_code += f"    if {var_name} is not None:\n"
-                            collect_code += f"        if isinstance({var_name}, str):\n"
-                            collect_code += f"            arguments['{p}'] = {var_name}.lower() in ('true', '1', 'yes')\n"
-                            collect_code += f"        else:\n"
-                            collect_code += f"            arguments['{p}'] = bool({var_name})\n"
-                    else:
-                        # String, array, object - pass through as-is
-                        # For optional string parameters, filter out empty strings
-                        if p in required_params:
-                            collect_code += f"    arguments['{p}'] = {var_name}\n"
-                        else:
-                            collect_code += f"    if {var_name} is not None and {var_name} != '':\n"
-                            collect_code += f"        arguments['{p}'] = {var_name}\n"
-            else:
-                params_str = ""
-                collect_code = "arguments = {}"
-            
-            # Create function using a factory that properly captures closure
-            # The key is to make sure variables are captured from the function parameters
-            def create_handler(
-                tool_name_inner: str,
-                tool_desc_inner: str,
-                tool_schema_inner: dict,
-                middleware_inner: Middleware,
-                tools_dict: dict,
-                param_list: list,
-                collect_code_inner: str,
-            ):
-                # Build the function body - variables are in create_handler's scope
-                if param_list:
-                    params_str_inner = ", ".join(param_list)
-                else:
-                    params_str_inner = ""
-                
-                # Create function code that references variables from create_handler's scope
-                # These will be captured in the closure when we exec
-                func_code = f"""async def handler({params_str_inner}):
-    \"\"\"{tool_desc_inner}\"\"\"
-    {collect_code_inner}
-    # Reference variables from outer scope (create_handler parameters)
-    if not middleware_inner:
-        raise RuntimeError("Middleware not initialized")
-    tool_desc = tools_dict.get(tool_name_inner, {{}}).get("description", "")
-    return await middleware_inner.call_tool(
-        tool_name=tool_name_inner,
-        arguments=arguments,
-        tool_description=tool_desc,
-        tool_schema=tool_schema_inner,
-    )
-"""
-                # Execute in local namespace
-                # The key is to put variables in globals so the function can access them
-                # When exec creates a function, it looks in globals for free variables
-                globals_dict = {
-                    "asyncio": asyncio,
-                    "Optional": Optional,
-                    "middleware_inner": middleware_inner,
-                    "tools_dict": tools_dict,
-                    "tool_name_inner": tool_name_inner,
-                    "tool_schema_inner": tool_schema_inner,
-                }
-                local_vars = {}
-                exec(func_code, globals_dict, local_vars)
-                handler_func = local_vars["handler"]
-                
-                # The function should now have access to the variables via globals
-                return handler_func
-            
-            # Create the handler with proper closure
-            handler = create_handler(
-                name,
-                desc,
-                schema,
-                middleware_ref,
-                tools_ref,
-                param_names,
-                collect_code,
-            )
-            
-            # Register with FastMCP
-            # Use 'name' (captured variable) instead of 'tool_name' (loop variable) to avoid closure issues
-            self.mcp.tool(name=name, description=desc)(handler)
+        # Add batch tool for fanning out several upstream calls at once
+        @self.mcp.tool()
+        async def batch_execute(
+            operations: List[Dict[str, Any]],
+            max_concurrent: int = 8,
+            stop_on_error: bool = False,
+        ) -> List[Dict[str, Any]]:
+            """Run several upstream tool calls concurrently. Mutating tools still require approval.
+
+            Args:
+                operations: Calls to make, each {"tool": name, "arguments": {...}}
+                max_concurrent: Maximum number of calls in flight at once
+                stop_on_error: Abort the whole batch on the first failing call
+
+            Returns:
+                One {index, tool, ok, result | error} entry per operation, in order
+            """
+            return await self._batch_execute(operations, max_concurrent, stop_on_error)
+
+        if self.settings.progressive_disclosure:
+            self._register_discovery_tools()
+        else:
+            # Advertise each upstream tool with its own schema; call handlers are
+            # only built the first time a tool is actually used
+            self.mcp.add_tools([self._build_upstream_tool(spec) for spec in self._tool_specs.values()])
 
         # Set up middleware to call upstream tools
         if self.middleware:
             self.middleware.set_upstream_tool_call(self._call_upstream_tool)
 
-    async def _call_upstream_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
-        """Call a tool on the upstream server.
+    def _explain_uncached(self, tool_name: str, canonical_arguments: bytes) -> str:
+        """Explain a tool call given its arguments as canonical JSON.
+
+        Memoized per proxy as _explain_canonical.
 
         Args:
             tool_name: Name of the tool
-            arguments: Arguments to pass
+            canonical_arguments: Arguments encoded with sorted keys
 
         Returns:
-            Result from upstream tool
+            Human-readable description
         """
-        # Debug: Log arguments being sent
-        debug_log("Calling upstream tool '{}' with arguments: {}", tool_name, arguments)
+        return self.middleware.explain_engine.explain(
+            tool_name=tool_name,
+            arguments=_json_loads(canonical_arguments),
+        )
 
-        # Create tool call request
-        request_id = self._request_id
-        self._request_id += 1
+    def _build_upstream_tool(self, spec: _ToolSpec) -> UpstreamTool:
+        """Create the FastMCP tool that advertises an upstream tool under its own name.
 
-        tool_request = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments,
-            },
-        }
+        Args:
+            spec: Parsed definition of the upstream tool
 
-        # Handle different transport types
-        if self.upstream_process:
-            # stdio transport
-            request_str = json.dumps(tool_request) + "\n"
-            self.upstream_process.stdin.write(request_str)
-            self.upstream_process.stdin.flush()
+        Returns:
+            Tool ready to be registered
+        """
+        return UpstreamTool(
+            name=spec.name,
+            description=spec.description,
+            parameters=spec.input_schema,
+            proxy=self,
+        )
+
+    def _add_upstream_tool(self, spec: _ToolSpec) -> None:
+        """Advertise an upstream tool on the FastMCP server under its own name.
+
+        Args:
+            spec: Parsed definition of the upstream tool
+        """
+        self.mcp.add_tool(self._build_upstream_tool(spec))
+
+    async def _batch_execute(
+        self,
+        operations: List[Dict[str, Any]],
+        max_concurrent: int,
+        stop_on_error: bool,
+    ) -> List[Dict[str, Any]]:
+        """Dispatch a batch of tool calls concurrently over the shared upstream connection.
+
+        Args:
+            operations: Calls to make, each {"tool": name, "arguments": {...}}
+            max_concurrent: Maximum number of calls in flight at once
+            stop_on_error: Cancel the remaining calls and raise on the first failure
+
+        Returns:
+            One result entry per operation, in order
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def run_operation(index: int, operation: Dict[str, Any]) -> Dict[str, Any]:
+            tool_name = operation.get("tool")
+            await self._ensure_tool(tool_name)
+            arguments = operation.get("arguments") or {}
+            self._validate_arguments(tool_name, arguments)
+            async with semaphore:
+                result = await self._dispatch_tool_call(tool_name, arguments)
+            return {"index": index, "tool": tool_name, "ok": True, "result": result}
+
+        tasks = [
+            asyncio.ensure_future(run_operation(index, operation))
+            for index, operation in enumerate(operations)
+        ]
+        if stop_on_error:
+            try:
+                return list(await asyncio.gather(*tasks))
+            except Exception:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        return [
+            outcome if not isinstance(outcome, BaseException) else {
+                "index": index,
+                "tool": operations[index].get("tool"),
+                "ok": False,
+                "error": str(outcome),
+            }
+            for index, outcome in enumerate(outcomes)
+        ]
+
+    def _register_discovery_tools(self) -> None:
+        """Expose upstream tools through discover/get_schema/invoke instead of one tool each.
+
+        Keeps the client's tools/list small for upstream servers with many tools;
+        full schemas are only sent when a client asks for them.
+        """
+        @self.mcp.tool()
+        async def discover_tools(query: str = "", limit: int = 10) -> List[Dict[str, str]]:
+            """List the available upstream tools with a short description of each.
+
+            Args:
+                query: Optional keywords; when given, only the best matching tools are returned
+                limit: Maximum number of matches to return for a query
+
+            Returns:
+                Tool names and one-line descriptions
+            """
+            if limit < 1:
+                raise ValueError(f"limit must be at least 1, got {limit}")
+            if self._tool_summaries is None:
+                self._tool_summaries = [
+                    {"name": spec.name, "description": _summarize_description(spec.description)}
+                    for spec in self._tool_specs.values()
+                ]
+            if not query.strip():
+                return self._tool_summaries
+
+            if self._tool_index is None:
+                self._tool_index = ToolSearchIndex.build(
+                    (
+                        (spec.name, {"name": spec.name, "description": spec.description})
+                        for spec in self._tool_specs.values()
+                    ),
+                    field_weights={"name": 3.0, "description": 1.0},
+                )
+            summaries_by_name = {summary["name"]: summary for summary in self._tool_summaries}
+            return [summaries_by_name[name] for name in self._tool_index.search(query, top_k=limit)]
+
+        @self.mcp.tool()
+        async def get_schema(tool_name: str) -> Dict[str, Any]:
+            """Get the full description and input schema of an upstream tool.
+
+            Args:
+                tool_name: Name of the tool, as returned by discover_tools
+
+            Returns:
+                Tool name, description, and JSON input schema
+            """
+            await self._ensure_tool(tool_name)
+            spec = self._tool_specs[tool_name]
+            return {
+                "name": spec.name,
+                "description": spec.description,
+                "inputSchema": spec.input_schema,
+            }
+
+        @self.mcp.tool()
+        async def invoke(tool_name: str, arguments: Dict[str, Any]) -> ToolResult:
+            """Call an upstream tool. Mutating tools still require approval.
+
+            Args:
+                tool_name: Name of the tool, as returned by discover_tools
+                arguments: Arguments matching the tool's input schema
+
+            Returns:
+                Result from the upstream tool
+            """
+            await self._ensure_tool(tool_name)
+            # invoke's own schema can't describe the target tool, so nothing has
+            # checked these arguments yet
+            self._validate_arguments(tool_name, arguments)
+            return _to_tool_result(await self._dispatch_tool_call(tool_name, arguments))
+
+    def _validate_arguments(self, tool_name: str, arguments: Any) -> None:
+        """Check call arguments against a known upstream tool's input schema.
+
+        Args:
+            tool_name: Name of the upstream tool
+            arguments: Arguments received from the client
+
+        Raises:
+            ValueError: If the arguments do not match the tool's input schema
+        """
+        spec = self._tool_specs[tool_name]
+        validator = self._argument_validators.get(tool_name)
+        if validator is None:
+            schema = spec.input_schema
+            validator = jsonschema.validators.validator_for(schema)(schema)
+            self._argument_validators[tool_name] = validator
+        _check_arguments(spec, arguments, validator)
+
+    async def _dispatch_tool_call(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Route a proxied tool call through its handler, building the handler on first use.
+
+        Args:
+            tool_name: Name of the upstream tool
+            arguments: Arguments received from the client
+
+        Returns:
+            Result from the middleware
+        """
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
+            spec = self._tool_specs.get(tool_name) or _ToolSpec.from_tool({"name": tool_name})
+            handler = self._make_tool_handler(spec)
+            self._tool_handlers[tool_name] = handler
+        return await handler(arguments)
+
+    def _make_tool_handler(self, spec: _ToolSpec) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+        """Build a handler that forwards a tool call through the middleware.
+
+        Args:
+            spec: Parsed definition of the upstream tool
+
+        Returns:
+            Async handler taking the raw argument dict
+        """
+        param_types = spec.param_types
+        required_params = spec.required
+
+        debug_log("Tool '{}' schema - required: {}, properties: {}",
+                 spec.name, set(required_params), [name for name, _ in param_types])
+
+        # Everything fixed per tool is bound as keyword defaults so the per-call
+        # path reads fast locals instead of closure cells and globals
+        async def handler(
+            kwargs: Dict[str, Any],
+            *,
+            _param_types: Tuple[Tuple[str, str], ...] = param_types,
+            _required: FrozenSet[str] = required_params,
+            _tool_name: str = spec.name,
+            _description: str = spec.description,
+            _schema: Dict[str, Any] = spec.input_schema,
+            _extra_arguments: bool = spec.extra_arguments,
+            _coerced_types: FrozenSet[str] = _COERCED_JSON_TYPES,
+            _coerce: Callable[[Any, str], Any] = _coerce_argument,
+            _missing: Any = _MISSING,
+        ) -> Any:
+            # Convert string parameters to their correct types based on schema.
+            # Arguments the client left out stay out; they are never filled in.
+            arguments = {}
+            for param_name, param_type in _param_types:
+                value = kwargs.get(param_name, _missing)
+                if value is _missing:
+                    continue
+                if value is None:
+                    if param_name in _required:
+                        arguments[param_name] = None
+                    continue
+                # For optional string/array/object parameters, filter out empty strings
+                if param_type not in _coerced_types and value == "" and param_name not in _required:
+                    continue
+                arguments[param_name] = _coerce(value, param_type)
+            if _extra_arguments:
+                for param_name, value in kwargs.items():
+                    if param_name not in arguments and param_name not in _schema.get("properties", {}):
+                        arguments[param_name] = value
+
+            # Looked up per call so a middleware set after the handler was built is used
+            middleware = self.middleware
+            if not middleware:
+                raise RuntimeError("Middleware not initialized")
+            # Positional: (tool_name, arguments, tool_description, tool_schema)
+            return await middleware.call_tool(_tool_name, arguments, _description, _schema)
+
+        return handler
+
+    def _encode_tool_call(self, request_id: int, tool_name: str, arguments: Dict[str, Any]) -> bytes:
+        """Encode a tools/call request, reusing a cached per-tool envelope prefix.
+
+        Args:
+            request_id: JSON-RPC request ID
+            tool_name: Name of the tool
+            arguments: Arguments to pass
+
+        Returns:
+            Newline-terminated JSON-RPC request bytes
+        """
+        encoded_arguments = _json_dumps(arguments)
 
-            # Read response asynchronously
-            loop = asyncio.get_event_loop()
-            response_line = await loop.run_in_executor(
-                None, self.upstream_process.stdout.readline
+        prefix = self._call_prefixes.get(tool_name)
+        if prefix is None:
+            prefix = (
+                b'{"jsonrpc":"2.0","method":"tools/call","params":{"name":'
+                + json.dumps(tool_name).encode("utf-8")
+                + b',"arguments":'
             )
-            if not response_line:
-                raise RuntimeError("No response from upstream server")
+            self._call_prefixes[tool_name] = prefix
+        return b"".join((
+            prefix,
+            encoded_arguments,
+            b'},"id":',
+            str(request_id).encode("ascii"),
+            b"}\n",
+        ))
+
+    async def _send_upstream_request(self, request_id: int, request_body: bytes, label: str) -> Dict[str, Any]:
+        """Send an encoded JSON-RPC request upstream and wait for its response.
 
-            response = json.loads(response_line.strip())
+        Args:
+            request_id: JSON-RPC request ID carried in the request body
+            request_body: Encoded request, newline-terminated
+            label: What the request is for, used in error messages
+
+        Returns:
+            JSON-RPC response message
+        """
+        # Handle different transport types
+        if self.upstream_process:
+            # stdio transport: register a future for this ID, then write the request.
+            # The reader thread resolves it when the matching response arrives, so
+            # several calls can be in flight on the same pipe at once.
+            # The write itself is synchronous, so requests can't interleave.
+            request_future = asyncio.get_running_loop().create_future()
+            self.upstream_pending_responses[request_id] = request_future
+            try:
+                # Checked after registering, so a reader that hits EOF concurrently
+                # either sees this future when failing pending requests or we see
+                # the flag here
+                if self._upstream_closed or self.upstream_process.poll() is not None:
+                    raise RuntimeError(self._upstream_closed_message())
+                self._write_upstream(request_body)
+                response = await asyncio.wait_for(
+                    request_future, timeout=self.settings.upstream.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"Timeout waiting for response to {label} from upstream server")
+            finally:
+                self.upstream_pending_responses.pop(request_id, None)
         elif self.upstream_http_client:
             # HTTP/SSE transport
             if self.upstream_sse_stream and self.upstream_messages_url:
@@ -916,13 +1692,15 @@ class ProxyServer:
                     # Send POST request to /messages
                     await self.upstream_http_client.post(
                         self.upstream_messages_url,
-                        json=tool_request,
+                        content=request_body,
                         headers=post_headers,
                     )
                     # Wait for response via SSE (with timeout)
-                    response = await asyncio.wait_for(request_future, timeout=60.0)
+                    response = await asyncio.wait_for(
+                        request_future, timeout=self.settings.upstream.timeout_seconds
+                    )
                 except asyncio.TimeoutError:
-                    raise RuntimeError(f"Timeout waiting for response to tool '{tool_name}' from SSE server")
+                    raise RuntimeError(f"Timeout waiting for response to {label} from SSE server")
                 except httpx.HTTPError as e:
                     error_msg = f"HTTP request to upstream server failed: {e}"
                     if hasattr(e, 'response') and e.response is not None:
@@ -945,11 +1723,11 @@ class ProxyServer:
                 try:
                     http_response = await self.upstream_http_client.post(
                         request_url,
-                        json=tool_request,
+                        content=request_body,
                         headers=request_headers,
                     )
                     http_response.raise_for_status()
-                    response = http_response.json()
+                    response = _json_loads(http_response.content)
                 except httpx.HTTPError as e:
                     error_msg = f"HTTP request to upstream server failed: {e}"
                     if hasattr(e, 'response') and e.response is not None:
@@ -961,30 +1739,91 @@ class ProxyServer:
         else:
             raise RuntimeError("Upstream server not available")
 
-        # Debug: Log response structure
-        debug_log("Upstream tool '{}' response structure: {}", 
-                 tool_name, json.dumps(response, indent=2)[:500])
+        return response
 
-        if "error" in response:
-            raise RuntimeError(f"Upstream tool call failed: {response['error']}")
+    async def _call_upstream_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool on the upstream server.
+
+        Args:
+            tool_name: Name of the tool
+            arguments: Arguments to pass
+
+        Returns:
+            Result from upstream tool
+        """
+        # Debug: Log arguments being sent
+        debug_log("Calling upstream tool '{}' with arguments: {}", tool_name, arguments)
+
+        # Idempotent tools can reuse a recent identical call
+        cache_key = None
+        invalidates = False
+        generation = self._result_cache_generation
+        if tool_name in self._cacheable_tools:
+            canonical = _json_dumps(arguments, sort_keys=True)
+            cache_key = (tool_name, hashlib.blake2b(canonical, digest_size=16).digest())
+            cached = self._result_cache.get(cache_key)
+            if cached is not None and cached[0] > time.monotonic():
+                self._result_cache.move_to_end(cache_key)
+                debug_log("Using cached result for upstream tool '{}'", tool_name)
+                return cached[1]
+        elif tool_name not in self._side_effect_free_tools:
+            # This call may change what cached reads would return
+            invalidates = True
+            self._invalidate_result_cache()
+
+        # Create tool call request
+        request_id = next(self._request_ids)
+
+        request_body = self._encode_tool_call(request_id, tool_name, arguments)
+
+        try:
+            response = await self._send_upstream_request(
+                request_id, request_body, f"tool '{tool_name}'"
+            )
+        finally:
+            if invalidates:
+                # Reads that started while this call was running may have seen the
+                # old state; don't let them be cached past its completion
+                self._invalidate_result_cache()
+
+        # Debug: Log response structure (only pay for the dump when debugging)
+        if is_debug_enabled():
+            debug_log("Upstream tool '{}' response structure: {}",
+                     tool_name, json.dumps(response, indent=2)[:500])
+
+        error = response.get("error")
+        if error is not None:
+            raise RuntimeError(f"Upstream tool call failed: {error}")
 
         # Pass through the entire result structure as-is
         # We're a proxy/wrapper - our job is approval interception, not response transformation
         # The upstream MCP server knows best how to format its responses
-        if "result" in response:
-            result = response["result"]
-            
+        result = response.get("result")
+        if result is not None:
             # FastMCP expects tool handlers to return the content array directly
             # (it will wrap it in the MCP result format)
             # If result has content array, return it so all items are preserved
-            if "content" in result and isinstance(result["content"], list):
-                return result["content"]
-            
-            # Otherwise return the full result structure
-            # FastMCP will handle it appropriately
-            return result
+            # Otherwise return the full result structure and let FastMCP handle it
+            content = result.get("content")
+            if isinstance(content, list):
+                result = content
 
-        return None
+        # Skip storing if a possibly mutating call ran since this one started
+        if cache_key is not None and generation == self._result_cache_generation:
+            self._result_cache[cache_key] = (
+                time.monotonic() + self.settings.tool_cache_ttl_seconds,
+                result,
+            )
+            self._result_cache.move_to_end(cache_key)
+            if len(self._result_cache) > self.settings.tool_cache_size:
+                self._result_cache.popitem(last=False)
+
+        return result
+
+    def _invalidate_result_cache(self) -> None:
+        """Drop cached results, and any result still being fetched, after a possible write."""
+        self._result_cache.clear()
+        self._result_cache_generation += 1
 
     async def _read_sse_events(self, sse_url: str, sse_headers: Dict[str, str]) -> None:
         """Read SSE events from upstream server and match them to pending requests.
@@ -1020,7 +1859,7 @@ class ProxyServer:
                             continue
                         
                         try:
-                            message = json.loads(buffer)
+                            message = _json_loads(buffer)
                             
                             # Check if this is a response to a pending request
                             if "id" in message:
@@ -1056,6 +1895,130 @@ class ProxyServer:
                 if not future.done():
                     future.set_exception(RuntimeError(f"SSE connection error: {e}"))
 
+    def _write_upstream(self, *chunks: bytes) -> None:
+        """Write encoded messages to the upstream stdin pipe.
+
+        Uses a single gathered os.writev() on the pipe's file descriptor where the
+        platform supports it, so chunks are never concatenated or double-buffered.
+
+        Args:
+            *chunks: Byte strings to write, in order
+        """
+        if self._upstream_stdin_fd is None:
+            for chunk in chunks:
+                self.upstream_process.stdin.write(chunk)
+            self.upstream_process.stdin.flush()
+            return
+
+        written = os.writev(self._upstream_stdin_fd, chunks)
+        if written < sum(len(chunk) for chunk in chunks):
+            # Partial write (e.g. interrupted by a signal) - finish the remainder
+            remaining = memoryview(b"".join(chunks))[written:]
+            while remaining:
+                remaining = remaining[os.write(self._upstream_stdin_fd, remaining):]
+
+    def _read_upstream_stderr(self) -> str:
+        """Read the first chunk of upstream stderr for error reporting.
+
+        Returns:
+            Decoded stderr output, or an empty string if unavailable
+        """
+        if not self.upstream_process or not self.upstream_process.stderr:
+            return ""
+        try:
+            return self.upstream_process.stderr.read(1024).decode("utf-8", errors="replace")
+        except Exception:
+            return ""
+
+    def _upstream_closed_message(self) -> str:
+        """Describe why the upstream stdio server can no longer answer requests."""
+        returncode = self.upstream_process.poll() if self.upstream_process else None
+        if returncode is None:
+            return "No response from upstream server"
+        return f"No response from upstream server (process exited with code {returncode})"
+
+    def _fail_unparsable_response(self, line: bytes) -> None:
+        """Fail the request an unparsable stdio response belongs to.
+
+        The line can't be decoded, so its request ID is recovered by matching
+        "id" members against pending requests. If that doesn't single out one
+        request, every pending request is failed rather than left waiting.
+
+        Args:
+            line: Raw response line from upstream stdout
+        """
+        pending = self.upstream_pending_responses
+        candidates = {
+            int(match) for match in _RESPONSE_ID_PATTERN.findall(line) if int(match) in pending
+        }
+        if len(candidates) == 1:
+            futures = [pending.get(candidates.pop())]
+        else:
+            futures = list(pending.values())
+        error = RuntimeError("Upstream server sent a response that is not valid JSON")
+        for future in futures:
+            if future is not None:
+                future.get_loop().call_soon_threadsafe(_set_future_exception, future, error)
+
+    def _read_stdio_responses(self) -> None:
+        """Read JSON-RPC responses from the upstream stdio pipe and match them to pending requests.
+
+        Runs in its own thread rather than as a task on the server's event loop:
+        Proactor loops (Windows) cannot watch pipes, so a loop-based reader would
+        still need a worker thread there. os.read releases the GIL while waiting, and
+        the thread is a daemon so a read blocked on a hung upstream never holds up
+        interpreter exit. Everything that arrived in one read is demultiplexed
+        together and handed to the event loop in a single callback, so a burst of
+        responses costs one loop wakeup rather than one each.
+        """
+        reader = self._upstream_stdout
+        try:
+            while reader is not None:
+                lines = reader.read_lines_blocking()
+                if not lines:
+                    break
+
+                batch: List[Tuple[asyncio.Future, Any]] = []
+                for line in lines:
+                    if not line.strip():
+                        continue
+
+                    try:
+                        message = _json_loads(line)
+                    except ValueError:
+                        # JSONDecodeError, or UnicodeDecodeError for invalid UTF-8
+                        debug_log("Invalid JSON from upstream stdio: {}", line[:200])
+                        self._fail_unparsable_response(line)
+                        continue
+
+                    request_id = message.get("id") if isinstance(message, dict) else None
+                    future = self.upstream_pending_responses.get(request_id)
+                    if future is not None:
+                        batch.append((future, message))
+                        debug_log("Matched stdio response for request ID: {}", request_id)
+
+                if batch:
+                    # Every future belongs to the server's one event loop
+                    batch[0][0].get_loop().call_soon_threadsafe(_set_future_results, batch)
+        finally:
+            # Upstream closed its stdout (or the pipe failed) - refuse new requests,
+            # then fail everything still waiting (in that order; see
+            # _send_upstream_request)
+            self._upstream_closed = True
+            for future in list(self.upstream_pending_responses.values()):
+                future.get_loop().call_soon_threadsafe(
+                    _set_future_exception, future, RuntimeError(self._upstream_closed_message())
+                )
+
+    def close(self) -> None:
+        """Shut down the upstream stdio process, if one was started.
+
+        Safe to call more than once. Also runs automatically when the proxy is
+        garbage collected or the interpreter exits.
+        """
+        if self._upstream_finalizer is not None:
+            self._upstream_finalizer()
+
     async def create_server(self) -> FastMCP:
         """Create and configure the FastMCP server.
 
@@ -1073,31 +2036,64 @@ class ProxyServer:
 
         return self.mcp
 
-    def run(
+    async def aclose(self) -> None:
+        """Close every upstream connection: SSE listener, HTTP client, and stdio process."""
+        if self.upstream_sse_task is not None:
+            self.upstream_sse_task.cancel()
+            try:
+                await self.upstream_sse_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self.upstream_sse_task = None
+        for client in (self.upstream_sse_stream, self.upstream_http_client):
+            if client is not None:
+                await client.aclose()
+        self.upstream_sse_stream = None
+        self.upstream_http_client = None
+        self.close()
+
+    async def run_async(
         self,
         transport: str = "stdio",
         host: str = "127.0.0.1",
         port: int = 8000,
     ) -> None:
-        """Run the proxy server.
+        """Connect to upstream and serve on the current event loop.
+
+        Upstream connections (HTTP clients, the SSE listener task) are created on
+        this same loop, so they stay usable for the lifetime of the server.
 
         Args:
             transport: Transport type (stdio, http, sse)
             host: Host for HTTP/SSE transport
             port: Port for HTTP/SSE transport
         """
-        # Create server first (this connects to upstream and sets up tools)
-        asyncio.run(self.create_server())
+        if transport not in ("stdio", "http", "sse"):
+            raise ValueError(f"Unsupported transport: {transport}")
 
-        if not self.mcp:
-            raise RuntimeError("Failed to create MCP server")
+        try:
+            # Create server first (this connects to upstream and sets up tools)
+            await self.create_server()
 
-        # Run the server (this is blocking and handles the event loop)
-        if transport == "stdio":
-            self.mcp.run(transport="stdio")
-        elif transport == "http":
-            self.mcp.run(transport="http", host=host, port=port)
-        elif transport == "sse":
-            self.mcp.run(transport="sse", host=host, port=port)
-        else:
-            raise ValueError(f"Unsupported transport: {transport}")
+            # Every connected client shares the one upstream connection
+            if transport == "stdio":
+                await self.mcp.run_async(transport="stdio")
+            else:
+                await self.mcp.run_async(transport=transport, host=host, port=port)
+        finally:
+            await self.aclose()
+
+    def run(
+        self,
+        transport: str = "stdio",
+        host: str = "127.0.0.1",
+        port: int = 8000,
+    ) -> None:
+        """Run the proxy server.
+
+        Args:
+            transport: Transport type (stdio, http, sse)
+            host: Host for HTTP/SSE transport
+            port: Port for HTTP/SSE transport
+        """
+        asyncio.run(self.run_async(transport=transport, host=host, port=port))
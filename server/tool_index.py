@@ -0,0 +1,136 @@
+"""Keyword search over upstream tools for progressive tool disclosure."""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+# Splits on anything that isn't a letter or digit and on camelCase boundaries,
+# so "read_file", "readFile" and "READ-FILE" all yield "read" and "file"
+_TOKEN_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|[0-9]+")
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms.
+
+    Args:
+        text: Tool name, description, or query
+
+    Returns:
+        List of terms
+    """
+    return [token.lower() for token in _TOKEN_PATTERN.findall(text)]
+
+
+class ToolSearchIndex:
+    """BM25F index over tool names and descriptions.
+
+    Built once per tools/list; a search only touches the postings of the query
+    terms instead of scanning every tool.
+    """
+
+    def __init__(
+        self,
+        field_weights: Dict[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            field_weights: Weight per indexed field (e.g. {"name": 3.0, "description": 1.0})
+            k1: Term frequency saturation
+            b: Field length normalization
+        """
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._doc_ids: List[str] = []
+        self._field_lengths: List[Dict[str, int]] = []
+        self._avg_field_lengths: Dict[str, float] = {}
+        # term -> [(doc index, {field: term frequency})]
+        self._postings: Dict[str, List[Tuple[int, Dict[str, int]]]] = defaultdict(list)
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[Tuple[str, Dict[str, str]]],
+        field_weights: Dict[str, float],
+    ) -> "ToolSearchIndex":
+        """Build an index from (document ID, {field: text}) pairs.
+
+        Args:
+            documents: Documents to index
+            field_weights: Weight per indexed field
+
+        Returns:
+            Populated index
+        """
+        index = cls(field_weights)
+        for doc_id, fields in documents:
+            index.add(doc_id, fields)
+        index._finalize()
+        return index
+
+    def add(self, doc_id: str, fields: Dict[str, str]) -> None:
+        """Add a document to the index.
+
+        Args:
+            doc_id: Document ID (the tool name)
+            fields: Text for each indexed field
+        """
+        doc_index = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+
+        lengths = {}
+        term_fields: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for field in self.field_weights:
+            tokens = _tokenize(fields.get(field, ""))
+            lengths[field] = len(tokens)
+            for term, count in Counter(tokens).items():
+                term_fields[term][field] = count
+        self._field_lengths.append(lengths)
+
+        for term, frequencies in term_fields.items():
+            self._postings[term].append((doc_index, frequencies))
+
+    def _finalize(self) -> None:
+        """Compute average field lengths after all documents are added."""
+        doc_count = len(self._doc_ids) or 1
+        self._avg_field_lengths = {
+            field: (sum(lengths[field] for lengths in self._field_lengths) / doc_count) or 1.0
+            for field in self.field_weights
+        }
+
+    def search(self, query: str, top_k: int = 10) -> List[str]:
+        """Rank documents against a free-text query.
+
+        Args:
+            query: Search terms
+            top_k: Maximum number of results; values below 1 return nothing
+
+        Returns:
+            Matching document IDs, best match first
+        """
+        if top_k < 1:
+            return []
+        doc_count = len(self._doc_ids)
+        scores: Dict[int, float] = defaultdict(float)
+
+        for term in set(_tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_index, frequencies in postings:
+                # BM25F: combine length-normalized field frequencies, then saturate once
+                weighted_tf = 0.0
+                for field, count in frequencies.items():
+                    norm = 1 - self.b + self.b * (
+                        self._field_lengths[doc_index][field] / self._avg_field_lengths[field]
+                    )
+                    weighted_tf += self.field_weights[field] * count / norm
+                scores[doc_index] += idf * weighted_tf / (self.k1 + weighted_tf)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [self._doc_ids[doc_index] for doc_index, _ in ranked[:top_k]]
@@ -15,11 +15,26 @@ Run: python3 setup_wizard.py
 import json
 import os
 import platform
+import re
+import shutil
+import stat
 import subprocess
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    # Gives input() line editing and history; not available on Windows
+    import readline
+except ImportError:
+    readline = None
+
+
+# Operating system name ("Linux", "Darwin", "Windows"); fixed for the whole run
+SYSTEM = platform.system()
+
 
 class Colors:
     """Terminal colors for better UX."""
@@ -33,11 +48,43 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Leave out escape codes when output is piped or logged, when NO_COLOR is set
+# (https://no-color.org), and on Windows consoles other than Windows Terminal,
+# which print them literally
+if (
+    not sys.stdout.isatty()
+    or os.environ.get("NO_COLOR")
+    or (SYSTEM == "Windows" and not os.environ.get("WT_SESSION"))
+):
+    for _name in ("HEADER", "BLUE", "CYAN", "GREEN", "YELLOW", "RED", "END", "BOLD"):
+        setattr(Colors, _name, "")
+
+
+# Rule printed above and below headers
+HEADER_BAR = f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}"
+
+# Rule printed above and below section titles
+SECTION_BAR = "─" * 70
+
+# Color codes around input() prompts. readline needs escape codes marked as
+# zero-width (\001...\002), otherwise it miscounts the prompt length and
+# garbles line editing
+if readline is not None and Colors.CYAN:
+    PROMPT_START = f"\001{Colors.CYAN}\002"
+    PROMPT_END = f"\001{Colors.END}\002"
+else:
+    PROMPT_START = Colors.CYAN
+    PROMPT_END = Colors.END
+
+
 def print_header(text: str) -> None:
     """Print a formatted header."""
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'=' * 70}{Colors.END}\n")
+    print(f"\n{HEADER_BAR}\n{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}\n{HEADER_BAR}\n")
+
+
+def print_section(title: str) -> None:
+    """Print a section title between rules."""
+    print(f"\n{SECTION_BAR}\n{title}\n{SECTION_BAR}")
 
 
 def print_step(step: int, total: int, text: str) -> None:
@@ -67,7 +114,13 @@ def prompt(question: str, default: Optional[str] = None) -> str:
     else:
         question = f"{question}: "
 
-    response = input(f"{Colors.CYAN}{question}{Colors.END}").strip()
+    try:
+        response = input(f"{PROMPT_START}{question}{PROMPT_END}").strip()
+    except EOFError:
+        # Non-interactive run with no answers left on stdin: take the default
+        # instead of failing
+        print()
+        response = ""
     return response if response else (default or "")
 
 
@@ -81,21 +134,61 @@ def prompt_yes_no(question: str, default: bool = False) -> bool:
     return response in ['y', 'yes']
 
 
-def run_command(cmd: list, cwd: Optional[Path] = None, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a command and return result."""
+def run_command(
+    cmd: list,
+    cwd: Optional[Path] = None,
+    check: bool = True,
+    capture: bool = False,
+    timeout: Optional[float] = None,
+    show_output: bool = False,
+) -> subprocess.CompletedProcess:
+    """Run a command and return result.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory
+        check: Raise CalledProcessError if the command fails
+        capture: Capture stdout for the caller to read. Otherwise stdout is
+            discarded; stderr is always kept for error reporting.
+        timeout: Seconds before the command is killed. With check=False a
+            timed-out command is reported as failed instead of raising.
+        show_output: Let stdout go straight to the terminal as the command
+            runs (e.g. pip's progress during long installs) instead of
+            discarding it. Ignored when capture is set.
+    """
+    if capture:
+        stdout = subprocess.PIPE
+    elif show_output:
+        stdout = None
+    else:
+        stdout = subprocess.DEVNULL
+
     try:
         result = subprocess.run(
             cmd,
             cwd=cwd,
-            capture_output=True,
+            stdout=stdout,
+            stderr=subprocess.PIPE,
             text=True,
-            check=check
+            check=check,
+            timeout=timeout,
         )
         return result
     except subprocess.CalledProcessError as e:
         print_error(f"Command failed: {' '.join(cmd)}")
         print_error(f"Error: {e.stderr}")
         raise
+    except subprocess.TimeoutExpired:
+        if check:
+            print_error(f"Command timed out after {timeout}s: {' '.join(cmd)}")
+            raise
+        return subprocess.CompletedProcess(cmd, 1, stdout="", stderr=f"Timed out after {timeout}s")
+
+
+# Seconds to wait for quick checks (version probes, pip show) before giving up on
+# them, e.g. for a binary on an unresponsive network filesystem. Installs have no
+# limit; pip applies its own network timeouts.
+PROBE_TIMEOUT = 10.0
 
 
 def find_python_installations() -> list[tuple[str, tuple[int, int, int]]]:
@@ -112,37 +205,60 @@ def find_python_installations() -> list[tuple[str, tuple[int, int, int]]]:
         "python3", "python"
     ]
 
-    checked_paths = set()  # Avoid duplicates
-
+    # Resolve names in-process (also works on Windows, which has no 'which')
+    python_paths = []
+    resolved_paths = set()  # Avoid duplicates
     for name in python_names:
+        python_path = shutil.which(name)
+        if not python_path:
+            continue
+        # Skip symlinks to an interpreter we already found (e.g. python3 -> python3.12)
+        resolved_path = os.path.realpath(python_path)
+        if resolved_path in resolved_paths:
+            continue
+        resolved_paths.add(resolved_path)
+        python_paths.append(python_path)
+
+    # Start every version probe before waiting on any of them, so the
+    # interpreters start up side by side instead of one after another
+    current_python = os.path.realpath(sys.executable) if sys.executable else None
+    probes = []
+    for python_path in python_paths:
+        if os.path.realpath(python_path) == current_python:
+            # The interpreter running this script needs no probe
+            probes.append((python_path, tuple(sys.version_info[:3])))
+            continue
         try:
-            # Use 'which' to find the executable
-            result = run_command(["which", name], check=False)
-            if result.returncode == 0:
-                python_path = result.stdout.strip()
-
-                # Skip if we've already checked this path (symlinks)
-                if python_path in checked_paths:
-                    continue
-                checked_paths.add(python_path)
-
-                # Get version
-                version_result = run_command([python_path, "--version"], check=False)
-                if version_result.returncode == 0:
-                    # Parse version string like "Python 3.12.0"
-                    version_str = version_result.stdout.strip()
-                    if version_str.startswith("Python "):
-                        version_parts = version_str.split()[1].split(".")
-                        if len(version_parts) >= 2:
-                            major = int(version_parts[0])
-                            minor = int(version_parts[1])
-                            micro = int(version_parts[2]) if len(version_parts) > 2 else 0
-
-                            # Only include Python 3.10+
-                            if major >= 3 and minor >= 10:
-                                python_versions.append((python_path, (major, minor, micro)))
-        except Exception:
+            # -S skips site imports; Python 2 fails on the print(*...) syntax
+            process = subprocess.Popen(
+                [python_path, "-S", "-c", "import sys; print(*sys.version_info[:3])"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError:
             continue
+        probes.append((python_path, process))
+
+    deadline = time.monotonic() + PROBE_TIMEOUT
+    for python_path, probe in probes:
+        if isinstance(probe, tuple):
+            version = probe
+        else:
+            try:
+                output, _ = probe.communicate(timeout=max(deadline - time.monotonic(), 0))
+                version = tuple(int(part) for part in output.split())
+            except subprocess.TimeoutExpired:
+                probe.kill()
+                probe.communicate()
+                continue
+            except Exception:
+                continue
+            if probe.returncode != 0 or len(version) != 3:
+                continue
+        # Only include Python 3.10+
+        if version[:2] >= (3, 10):
+            python_versions.append((python_path, version))
 
     # Sort by version (newest first)
     python_versions.sort(key=lambda x: x[1], reverse=True)
@@ -156,6 +272,20 @@ def select_python_version() -> Optional[str]:
     Returns:
         Path to selected Python executable, or None if none available
     """
+    # If running script with current Python and it's valid, offer that first; PATH
+    # is only searched for other interpreters if the user declines it
+    current_python = sys.executable
+    current_version = sys.version_info
+    if current_python and current_version[:2] >= (3, 10):
+        print(f"\n{Colors.CYAN}Detected current Python:{Colors.END}")
+        print(
+            f"  Python {current_version.major}.{current_version.minor}.{current_version.micro}"
+            f" - {current_python}"
+        )
+        if prompt_yes_no("\nUse this Python?", default=True):
+            print_success(f"Selected: {current_python}")
+            return current_python
+
     pythons = find_python_installations()
 
     if not pythons:
@@ -164,16 +294,6 @@ def select_python_version() -> Optional[str]:
         print("Please install Python 3.10 or higher from: https://www.python.org/downloads/")
         return None
 
-    # If running script with current Python and it's valid, prefer that
-    current_python = sys.executable
-    current_version = sys.version_info
-    if current_version.major >= 3 and current_version.minor >= 10:
-        # Check if current python is in our list
-        for path, version in pythons:
-            if path == current_python:
-                print_success(f"Using current Python: {path} (v{version[0]}.{version[1]}.{version[2]})")
-                return path
-
     # Show available options
     print(f"\n{Colors.CYAN}Available Python installations:{Colors.END}")
     for i, (path, version) in enumerate(pythons, 1):
@@ -207,16 +327,67 @@ def select_python_version() -> Optional[str]:
             return None
 
 
-def check_node_installed() -> bool:
-    """Check if Node.js is installed."""
+# Version commands of the tools the wizard checks for
+NODE_VERSION_CMD = ["node", "--version"]
+NGROK_VERSION_CMD = ["ngrok", "version"]
+
+# Version probes, by command, so each tool is only run once per setup
+_tool_versions: Dict[str, "Future[Optional[str]]"] = {}
+_probe_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _run_version_command(cmd: list) -> Optional[str]:
+    """Run a tool's version command.
+
+    Returns:
+        The reported version, or None if the tool is not installed or failed
+    """
     try:
-        result = run_command(["node", "--version"], check=False)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print_success(f"Node.js {version} detected")
-            return True
+        result = run_command(cmd, check=False, capture=True, timeout=PROBE_TIMEOUT)
     except FileNotFoundError:
-        pass
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def start_tool_version_probe(cmd: list) -> "Future[Optional[str]]":
+    """Start a tool's version command in the background, unless it already ran.
+
+    Probes started early run while the user is answering prompts, so the
+    check_*_installed helpers usually find their answer waiting.
+
+    Args:
+        cmd: Version command, e.g. NODE_VERSION_CMD
+
+    Returns:
+        Future resolving to the reported version, or None
+    """
+    global _probe_executor
+    key = " ".join(cmd)
+    if key not in _tool_versions:
+        if _probe_executor is None:
+            _probe_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="probe")
+        _tool_versions[key] = _probe_executor.submit(_run_version_command, cmd)
+    return _tool_versions[key]
+
+
+def _get_tool_version(cmd: list) -> Optional[str]:
+    """Get a tool's version, reusing an earlier or in-flight probe for the same command.
+
+    Args:
+        cmd: Version command, e.g. NODE_VERSION_CMD
+
+    Returns:
+        The reported version, or None if the tool is not installed or failed
+    """
+    return start_tool_version_probe(cmd).result()
+
+
+def check_node_installed() -> bool:
+    """Check if Node.js is installed."""
+    version = _get_tool_version(NODE_VERSION_CMD)
+    if version is not None:
+        print_success(f"Node.js {version} detected")
+        return True
 
     print_warning("Node.js not found (required for upstream MCP servers)")
     return False
@@ -224,20 +395,41 @@ def check_node_installed() -> bool:
 
 def check_ngrok_installed() -> bool:
     """Check if ngrok is installed."""
-    try:
-        result = run_command(["ngrok", "version"], check=False)
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            print_success(f"ngrok {version} detected")
-            return True
-    except FileNotFoundError:
-        pass
+    version = _get_tool_version(NGROK_VERSION_CMD)
+    if version is not None:
+        print_success(f"ngrok {version} detected")
+        return True
 
     print_warning("ngrok not installed")
     return False
 
 
-def create_venv(project_dir: Path, python_exe: str) -> Path:
+def _clear_readonly_and_retry(func, path, _exc) -> None:
+    """rmtree error handler: clear the read-only attribute and retry once.
+
+    Read-only files (common in .git and build output on Windows) can't be
+    deleted there until the attribute is cleared.
+    """
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
+
+
+def remove_tree(path: Path) -> None:
+    """Delete a directory tree, including read-only files.
+
+    Args:
+        path: Directory to delete
+
+    Raises:
+        OSError: If something still can't be removed
+    """
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_clear_readonly_and_retry)
+    else:
+        shutil.rmtree(path, onerror=_clear_readonly_and_retry)
+
+
+def create_venv(project_dir: Path, python_exe: str) -> tuple[Path, Path]:
     """Create virtual environment.
 
     Args:
@@ -245,79 +437,178 @@ def create_venv(project_dir: Path, python_exe: str) -> Path:
         python_exe: Path to Python executable to use
 
     Returns:
-        Path to venv directory
+        Tuple of (venv directory, venv Python executable)
     """
     venv_dir = project_dir / ".venv"
 
     if venv_dir.exists():
         if prompt_yes_no(f"Virtual environment already exists at {venv_dir}. Recreate?", default=False):
-            import shutil
-            shutil.rmtree(venv_dir)
+            remove_tree(venv_dir)
         else:
             print_success(f"Using existing virtual environment: {venv_dir}")
-            return venv_dir
+            return venv_dir, get_venv_python(venv_dir)
 
     print(f"Creating virtual environment with {python_exe}...")
     run_command([python_exe, "-m", "venv", str(venv_dir)])
     print_success(f"Virtual environment created: {venv_dir}")
-    return venv_dir
+    return venv_dir, get_venv_python(venv_dir)
 
 
 def get_venv_python(venv_dir: Path) -> Path:
     """Get path to Python in virtual environment."""
-    if platform.system() == "Windows":
+    if SYSTEM == "Windows":
         return venv_dir / "Scripts" / "python.exe"
     else:
         return venv_dir / "bin" / "python"
 
 
-def install_dependencies(venv_dir: Path, project_dir: Path) -> None:
-    """Install project dependencies."""
-    python_exe = get_venv_python(venv_dir)
+# First pip that can do editable installs of a pyproject.toml-only project (PEP 660)
+MIN_PIP_VERSION = (21, 3)
+
+
+# Added to every pip invocation: skip pip's online "new version available" check
+# (a request to PyPI on each run) and never wait for input that can't come
+PIP_OPTIONS = ("--disable-pip-version-check", "--no-input")
+
+
+def pip_command(python_exe: Path, *args: str) -> list[str]:
+    """Build a pip command line for a Python interpreter.
+
+    Args:
+        python_exe: Python executable whose pip to run
+        *args: pip subcommand and its arguments
+
+    Returns:
+        Command line including PIP_OPTIONS
+    """
+    return [str(python_exe), "-m", "pip", *args, *PIP_OPTIONS]
+
+
+def get_pip_version(python_exe: Path) -> tuple[int, ...]:
+    """Get the version of pip installed for a Python interpreter.
+
+    Importing pip's package is much quicker than starting pip itself.
+
+    Args:
+        python_exe: Python executable to check
+
+    Returns:
+        pip version as a tuple of ints, or (0,) if it could not be determined
+    """
+    result = run_command(
+        [str(python_exe), "-c", "import pip; print(pip.__version__)"],
+        check=False,
+        capture=True,
+        timeout=PROBE_TIMEOUT,
+    )
+    version = []
+    for part in result.stdout.strip().split("."):
+        if not part.isdigit():
+            break
+        version.append(int(part))
+    return tuple(version) or (0,)
+
+
+def normalize_package_name(name: str) -> str:
+    """Normalize a distribution name so that e.g. "slack_sdk" and "Slack-SDK" compare equal.
+
+    Args:
+        name: Package name
+
+    Returns:
+        Lowercase name with runs of "-", "_" and "." replaced by "-"
+    """
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def get_installed_packages(python_exe: Path) -> set[str]:
+    """List the packages installed in an environment with a single pip call.
+
+    Args:
+        python_exe: Python executable of the environment
+
+    Returns:
+        Normalized names of installed packages (empty if pip fails)
+    """
+    result = run_command(
+        pip_command(python_exe, "list", "--format=json"),
+        check=False,
+        capture=True,
+        timeout=PROBE_TIMEOUT * 3,
+    )
+    if result.returncode != 0:
+        return set()
+    try:
+        return {normalize_package_name(package["name"]) for package in json.loads(result.stdout)}
+    except (ValueError, KeyError, TypeError):
+        return set()
+
+
+# Build metadata directories left behind by earlier installs
+BUILD_METADATA_SUFFIXES = (".egg-info", ".dist-info")
+
+# Directories never searched for build artifacts (don't touch venv, git, etc.)
+BUILD_CLEANUP_EXCLUDE_DIRS = frozenset({
+    ".venv", ".git", "__pycache__", ".pytest_cache", ".mypy_cache", "node_modules",
+})
+
+
+def find_build_metadata(project_dir: Path, suffixes: tuple[str, ...]) -> list[Path]:
+    """Find build metadata directories (e.g. *.egg-info) in the project.
+
+    Walks the tree once, without descending into excluded directories such as
+    the virtual environment, or into the metadata directories themselves.
+
+    Args:
+        project_dir: Project directory
+        suffixes: Directory name suffixes to look for
+
+    Returns:
+        Matching directories
+    """
+    found = []
+    for root, dirs, _ in os.walk(project_dir):
+        kept = []
+        for name in dirs:
+            if name.endswith(suffixes):
+                found.append(Path(root) / name)
+            elif name not in BUILD_CLEANUP_EXCLUDE_DIRS:
+                kept.append(name)
+        dirs[:] = kept
+    return found
+
+
+def install_dependencies(python_exe: Path, project_dir: Path) -> None:
+    """Install project dependencies.
+
+    Args:
+        python_exe: Python executable of the virtual environment
+        project_dir: Project directory
+    """
 
     # Clean up any existing build artifacts to avoid conflicts
     # This is especially important when switching Python versions
-    import shutil
     cleaned = []
-    
-    # Directories to exclude from cleanup (don't touch venv, git, etc.)
-    exclude_dirs = {'.venv', '.git', '__pycache__', '.pytest_cache', '.mypy_cache', 'node_modules'}
-    
+
     # Clean up .egg-info and .dist-info directories (recursively)
-    # Track what we've cleaned to avoid duplicates
-    cleaned_paths = set()
-    
-    for pattern in ['*.egg-info', '*.dist-info']:
-        for item in project_dir.rglob(pattern):
-            # Skip if in an excluded directory
-            if any(excluded in item.parts for excluded in exclude_dirs):
-                continue
-                
-            if item.is_dir() and item not in cleaned_paths:
-                rel_path = item.relative_to(project_dir)
-                print(f"Removing existing build artifact: {rel_path}")
-                try:
-                    shutil.rmtree(item, ignore_errors=True)
-                    # Verify it's actually gone
-                    if item.exists():
-                        print_warning(f"Could not fully remove {rel_path}, trying again...")
-                        import time
-                        time.sleep(0.1)  # Brief pause
-                        shutil.rmtree(item, ignore_errors=True)
-                    cleaned.append(str(rel_path))
-                    cleaned_paths.add(item)
-                except Exception as e:
-                    print_warning(f"Error removing {rel_path}: {e}")
+    for item in find_build_metadata(project_dir, BUILD_METADATA_SUFFIXES):
+        rel_path = item.relative_to(project_dir)
+        print(f"Removing existing build artifact: {rel_path}")
+        try:
+            remove_tree(item)
+            cleaned.append(str(rel_path))
+        except OSError as e:
+            print_warning(f"Error removing {rel_path}: {e}")
     
     # Also clean up build/ and dist/ directories if they exist
     for dir_name in ['build', 'dist']:
         dir_path = project_dir / dir_name
-        if dir_path.exists() and dir_path.is_dir():
+        if dir_path.is_dir():
             print(f"Removing existing build directory: {dir_name}")
             try:
-                shutil.rmtree(dir_path, ignore_errors=True)
+                remove_tree(dir_path)
                 cleaned.append(dir_name)
-            except Exception as e:
+            except OSError as e:
                 print_warning(f"Error removing {dir_name}: {e}")
     
     if cleaned:
@@ -326,60 +617,21 @@ def install_dependencies(venv_dir: Path, project_dir: Path) -> None:
         print("No existing build artifacts found")
 
     print("Installing project dependencies...")
-    run_command([str(python_exe), "-m", "pip", "install", "--upgrade", "pip"])
-    
-    # Try to uninstall any existing installation first (ignore errors if not installed)
-    # This helps when switching Python versions
-    print("Checking for existing package installation...")
-    uninstall_result = run_command(
-        [str(python_exe), "-m", "pip", "uninstall", "-y", "cite-before-act-mcp"],
-        check=False
-    )
-    if uninstall_result.returncode == 0:
-        print_success("Removed existing package installation")
-    
-    # Final cleanup pass right before install (in case anything was created)
-    # Only clean from project root, not from venv or other excluded dirs
-    exclude_dirs = {'.venv', '.git', '__pycache__', '.pytest_cache', '.mypy_cache', 'node_modules'}
-    for item in list(project_dir.rglob('*.egg-info')):
-        # Skip if in an excluded directory
-        if any(excluded in item.parts for excluded in exclude_dirs):
-            continue
-        if item.is_dir() and item.exists():
-            print(f"Final cleanup: removing {item.relative_to(project_dir)}")
-            shutil.rmtree(item, ignore_errors=True)
-    
-    # Also do a targeted cleanup of any .egg-info in the project root specifically
-    # (these are the most likely culprits)
-    for item in project_dir.iterdir():
-        if item.is_dir() and item.name.endswith('.egg-info'):
-            print(f"Removing root-level .egg-info: {item.name}")
-            shutil.rmtree(item, ignore_errors=True)
-    
-    # Diagnostic: List any remaining .egg-info directories (should be none)
-    remaining_egg_info = []
-    for item in project_dir.rglob('*.egg-info'):
-        if any(excluded in item.parts for excluded in exclude_dirs):
-            continue
-        if item.is_dir() and item.exists():
-            remaining_egg_info.append(item.relative_to(project_dir))
-    
-    if remaining_egg_info:
-        print_warning(f"Found {len(remaining_egg_info)} remaining .egg-info directories:")
-        for path in remaining_egg_info:
-            print_warning(f"  - {path}")
-        print_warning("Attempting to remove them...")
-        for path in remaining_egg_info:
-            full_path = project_dir / path
-            shutil.rmtree(full_path, ignore_errors=True)
+    if get_pip_version(python_exe) < MIN_PIP_VERSION:
+        run_command(pip_command(python_exe, "install", "--upgrade", "pip"), show_output=True)
+    else:
+        print("pip is recent enough, skipping upgrade")
     
     # Install in editable mode
     # Note: setup_wizard.py is renamed from setup.py to avoid setuptools confusion
     # setuptools would try to use both setup.py and pyproject.toml, causing multiple .egg-info
+    # No separate uninstall needed: the editable install replaces any previous
+    # installation of the package in this environment
     print("Installing package in editable mode...")
     run_command(
-        [str(python_exe), "-m", "pip", "install", "--use-pep517", "-e", "."],
-        cwd=project_dir
+        pip_command(python_exe, "install", "--use-pep517", "-e", "."),
+        cwd=project_dir,
+        show_output=True,
     )
 
     print_success("Dependencies installed")
@@ -389,9 +641,7 @@ def configure_slack() -> Dict[str, Any]:
     """Configure Slack integration."""
     config = {}
 
-    print("\n" + "─" * 70)
-    print("Slack Configuration")
-    print("─" * 70)
+    print_section("Slack Configuration")
 
     if not prompt_yes_no("Do you want to enable Slack integration?", default=False):
         return {"enabled": False}
@@ -453,9 +703,7 @@ def configure_webex() -> Dict[str, Any]:
     """Configure Webex integration."""
     config = {}
 
-    print("\n" + "─" * 70)
-    print("Webex Configuration")
-    print("─" * 70)
+    print_section("Webex Configuration")
 
     if not prompt_yes_no("Do you want to enable Webex integration?", default=False):
         return {"enabled": False}
@@ -503,9 +751,7 @@ def configure_teams() -> Dict[str, Any]:
     """Configure Microsoft Teams integration."""
     config = {}
 
-    print("\n" + "─" * 70)
-    print("Microsoft Teams Configuration")
-    print("─" * 70)
+    print_section("Microsoft Teams Configuration")
 
     if not prompt_yes_no("Do you want to enable Microsoft Teams integration?", default=False):
         return {"enabled": False}
@@ -568,28 +814,17 @@ def configure_ngrok(slack_config: Dict[str, Any], webex_config: Dict[str, Any],
     Returns:
         ngrok configuration dict or None if not needed
     """
-    # Check if any platform needs webhooks
-    needs_webhook = (
-        slack_config.get("webhook_enabled") or
-        webex_config.get("webhook_enabled") or
-        teams_config.get("webhook_enabled")
-    )
-
-    if not needs_webhook:
+    # Slack webhooks are optional and may be self-hosted; Webex and Teams
+    # always need a webhook (and so ngrok) when enabled
+    slack_webhook = bool(slack_config.get("webhook_enabled"))
+    slack_uses_ngrok = slack_webhook and slack_config.get("webhook_hosting") == "ngrok"
+    other_webhooks = bool(webex_config.get("webhook_enabled") or teams_config.get("webhook_enabled"))
+
+    # Skip ngrok if nothing needs a webhook, or only a self-hosted Slack one does
+    if not (slack_uses_ngrok or other_webhooks):
         return None
 
-    # For Slack, check if using ngrok (vs self-hosted)
-    # For Webex and Teams, webhooks are always needed
-    slack_uses_ngrok = slack_config.get("webhook_enabled") and slack_config.get("webhook_hosting") == "ngrok"
-
-    # If Slack is enabled but using self-hosted, and no other platforms need webhooks, skip ngrok
-    if slack_config.get("webhook_enabled") and not slack_uses_ngrok:
-        if not (webex_config.get("enabled") or teams_config.get("enabled")):
-            return None
-
-    print("\n" + "─" * 70)
-    print("ngrok Configuration")
-    print("─" * 70)
+    print_section("ngrok Configuration")
 
     if not check_ngrok_installed():
         print("\n📥 Install ngrok:")
@@ -628,9 +863,7 @@ def configure_ngrok(slack_config: Dict[str, Any], webex_config: Dict[str, Any],
 
 def configure_upstream() -> Dict[str, Any]:
     """Configure upstream MCP server."""
-    print("\n" + "─" * 70)
-    print("Upstream MCP Server Configuration")
-    print("─" * 70)
+    print_section("Upstream MCP Server Configuration")
 
     print("\nThe upstream server is the MCP server you want to wrap with approval requirements.")
     print("\nCommon examples:")
@@ -662,9 +895,7 @@ def configure_upstream() -> Dict[str, Any]:
         }
     elif choice == "2":
         # GitHub MCP server (local only - remote requires OAuth which is complex)
-        print("\n" + "─" * 70)
-        print("GitHub MCP Server Setup (Local)")
-        print("─" * 70)
+        print_section("GitHub MCP Server Setup (Local)")
         print("\nThis will use a local GitHub MCP server binary.")
         print("\nNote: The remote GitHub MCP server requires OAuth authentication,")
         print("which is complex to set up. We recommend using the local server.")
@@ -677,7 +908,6 @@ def configure_upstream() -> Dict[str, Any]:
         print("  • GitHub Personal Access Token (create at https://github.com/settings/tokens)")
 
         # Check if github-mcp-server is in PATH
-        import shutil
         github_mcp_path = shutil.which("github-mcp-server")
         docker_path = shutil.which("docker")
 
@@ -752,6 +982,88 @@ def configure_upstream() -> Dict[str, Any]:
         return config
 
 
+# Fixed opening of the generated .env file, up to the secrets section
+ENV_FILE_HEADER = (
+    "# =============================================================================",
+    "# Cite-Before-Act MCP - Global Configuration and Secrets",
+    "# =============================================================================",
+    "# Generated by setup_wizard.py",
+    "#",
+    "# This file contains:",
+    "# - Secrets (tokens, passwords) - NEVER commit to git!",
+    "# - Global settings that apply to ALL MCP servers",
+    "#",
+    "# Server-specific config (UPSTREAM_COMMAND, UPSTREAM_ARGS, etc.) is in",
+    "# Claude Desktop's mcpServers config, NOT here.",
+    "#",
+    "# Environment variable precedence:",
+    "# 1. mcpServers.env (highest priority) - per-server overrides",
+    "# 2. This .env file (lower priority) - global defaults",
+    "# =============================================================================",
+    "",
+    "# -----------------------------------------------------------------------------",
+    "# Secrets (NEVER commit these to git!)",
+    "# -----------------------------------------------------------------------------",
+)
+
+# Section appended to an existing .env file when a GitHub server is added
+ENV_FILE_GITHUB_SECTION = (
+    "\n# -----------------------------------------------------------------------------\n"
+    "# GitHub Configuration (Global)\n"
+    "# -----------------------------------------------------------------------------\n"
+    "# GitHub Personal Access Token (global secret)\n"
+    "# Get from: https://github.com/settings/tokens\n"
+    "# Required scopes: repo, workflow, write:packages, delete:packages, admin:org\n"
+    "GITHUB_PERSONAL_ACCESS_TOKEN={token}\n"
+)
+
+# Fixed closing section of the generated .env file
+ENV_FILE_DETECTION_DEFAULTS = (
+    "",
+    "# -----------------------------------------------------------------------------",
+    "# Global Detection Defaults",
+    "# -----------------------------------------------------------------------------",
+    "# These are global defaults. Per-server DETECTION_ALLOWLIST and",
+    "# DETECTION_BLOCKLIST are set in Claude Desktop's mcpServers config.",
+    "",
+    "DETECTION_ENABLE_CONVENTION=true",
+    "DETECTION_ENABLE_METADATA=true",
+    "",
+)
+
+
+def read_env_file(env_path: Path) -> Dict[str, str]:
+    """Read KEY=value settings from a .env file.
+
+    Handles comments, blank lines, an optional "export " prefix and quoted
+    values, which covers everything this wizard writes.
+
+    Args:
+        env_path: Path to the .env file
+
+    Returns:
+        Settings by name; empty if the file doesn't exist or can't be read
+    """
+    try:
+        content = env_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return {}
+
+    values = {}
+    for line in content.splitlines():
+        line = line.strip()
+        if line.startswith("export "):
+            line = line[len("export "):]
+        key, sep, value = line.partition("=")
+        if not sep or key.startswith("#"):
+            continue
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[key.strip()] = value
+    return values
+
+
 def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_config: Dict[str, Any], teams_config: Dict[str, Any], upstream_config: Dict[str, Any]) -> None:
     """Generate .env file with secrets and global settings.
 
@@ -775,38 +1087,22 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
     """
     env_path = project_dir / ".env"
 
+    # "github_token" is present (possibly empty) whenever a GitHub server was configured
+    wants_github_token = "github_token" in upstream_config
+    github_token = upstream_config.get("github_token") or ""
+    slack_webhook = slack_config.get("webhook_enabled")
+
     # Check if .env exists and has required tokens
     if env_path.exists():
-        # Check if GitHub token is already set
-        has_github_token = False
-        try:
-            with open(env_path, "r") as f:
-                content = f.read()
-                # Check if GITHUB_PERSONAL_ACCESS_TOKEN has a value (not empty)
-                for line in content.split("\n"):
-                    if line.startswith("GITHUB_PERSONAL_ACCESS_TOKEN=") and "=" in line:
-                        value = line.split("=", 1)[1].strip()
-                        if value:  # Has a non-empty value
-                            has_github_token = True
-                            break
-        except Exception:
-            pass
+        # Check if GitHub token is already set (to a non-empty value)
+        has_github_token = bool(read_env_file(env_path).get("GITHUB_PERSONAL_ACCESS_TOKEN"))
 
         # If adding GitHub server and token not in .env, append it
-        if "github_token" in upstream_config and not has_github_token:
+        if wants_github_token and not has_github_token:
             print(f"\nAdding GitHub token to existing .env file...")
             try:
-                with open(env_path, "a") as f:
-                    f.write("\n# -----------------------------------------------------------------------------\n")
-                    f.write("# GitHub Configuration (Global)\n")
-                    f.write("# -----------------------------------------------------------------------------\n")
-                    f.write("# GitHub Personal Access Token (global secret)\n")
-                    f.write("# Get from: https://github.com/settings/tokens\n")
-                    f.write("# Required scopes: repo, workflow, write:packages, delete:packages, admin:org\n")
-                    if upstream_config.get("github_token"):
-                        f.write(f"GITHUB_PERSONAL_ACCESS_TOKEN={upstream_config['github_token']}\n")
-                    else:
-                        f.write("GITHUB_PERSONAL_ACCESS_TOKEN=\n")
+                with open(env_path, "a", encoding="utf-8") as f:
+                    f.write(ENV_FILE_GITHUB_SECTION.format(token=github_token))
                 print_success(f"Added GitHub configuration to .env file: {env_path}")
                 return
             except Exception as e:
@@ -819,46 +1115,20 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
 
     print("\nGenerating .env file...")
 
-    lines = [
-        "# =============================================================================",
-        "# Cite-Before-Act MCP - Global Configuration and Secrets",
-        "# =============================================================================",
-        "# Generated by setup_wizard.py",
-        "#",
-        "# This file contains:",
-        "# - Secrets (tokens, passwords) - NEVER commit to git!",
-        "# - Global settings that apply to ALL MCP servers",
-        "#",
-        "# Server-specific config (UPSTREAM_COMMAND, UPSTREAM_ARGS, etc.) is in",
-        "# Claude Desktop's mcpServers config, NOT here.",
-        "#",
-        "# Environment variable precedence:",
-        "# 1. mcpServers.env (highest priority) - per-server overrides",
-        "# 2. This .env file (lower priority) - global defaults",
-        "# =============================================================================",
-        "",
-        "# -----------------------------------------------------------------------------",
-        "# Secrets (NEVER commit these to git!)",
-        "# -----------------------------------------------------------------------------",
-    ]
+    lines = list(ENV_FILE_HEADER)
 
     # Add GitHub token if GitHub server was configured
-    if "github_token" in upstream_config:
-        # GitHub token was requested (either provided or skipped)
+    if wants_github_token:
+        # GitHub token was requested (either provided or skipped; empty is a
+        # placeholder for the user to fill in)
         lines.extend([
             "",
             "# GitHub Personal Access Token (global secret)",
             "# Get from: https://github.com/settings/tokens",
             "# Required scopes: repo, workflow, write:packages, delete:packages, admin:org",
+            f"GITHUB_PERSONAL_ACCESS_TOKEN={github_token}",
         ])
 
-        if upstream_config.get("github_token"):
-            # Token was provided
-            lines.append(f"GITHUB_PERSONAL_ACCESS_TOKEN={upstream_config['github_token']}")
-        else:
-            # Token not provided - add placeholder with instructions
-            lines.append("GITHUB_PERSONAL_ACCESS_TOKEN=")
-
     # Add Slack configuration if enabled
     if slack_config["enabled"]:
         lines.extend([
@@ -875,7 +1145,7 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
         elif slack_config.get("user_id"):
             lines.append(f"SLACK_USER_ID={slack_config['user_id']}")
 
-        if slack_config.get("webhook_enabled"):
+        if slack_webhook:
             lines.extend([
                 "",
                 "# Slack Webhook Configuration",
@@ -941,7 +1211,7 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
         ])
 
     # Webhook hosting configuration (applies to all platforms)
-    any_webhook = (slack_config.get("webhook_enabled") or
+    any_webhook = (slack_webhook or
                    webex_config.get("webhook_enabled") or
                    teams_config.get("webhook_enabled"))
 
@@ -954,7 +1224,7 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
         ])
 
         # Determine security mode based on Slack hosting choice (if applicable)
-        if slack_config.get("webhook_enabled"):
+        if slack_webhook:
             if slack_config.get("webhook_hosting") == "self-hosted":
                 lines.append("SECURITY_MODE=production")
                 lines.append("HOST=0.0.0.0  # Listen on all interfaces for production")
@@ -980,32 +1250,60 @@ def generate_env_file(project_dir: Path, slack_config: Dict[str, Any], webex_con
     ])
 
     # Set USE_GUI_APPROVAL based on any platform being enabled
-    if any([slack_config.get("enabled"), webex_config.get("enabled"), teams_config.get("enabled")]):
+    if slack_config.get("enabled") or webex_config.get("enabled") or teams_config.get("enabled"):
         lines.append("USE_GUI_APPROVAL=false  # Disabled when any platform is enabled")
     else:
         lines.append("USE_GUI_APPROVAL=true   # Enabled when no platforms are enabled")
 
     # Global detection defaults
-    lines.extend([
-        "",
-        "# -----------------------------------------------------------------------------",
-        "# Global Detection Defaults",
-        "# -----------------------------------------------------------------------------",
-        "# These are global defaults. Per-server DETECTION_ALLOWLIST and",
-        "# DETECTION_BLOCKLIST are set in Claude Desktop's mcpServers config.",
-        "",
-        "DETECTION_ENABLE_CONVENTION=true",
-        "DETECTION_ENABLE_METADATA=true",
-        "",
-    ])
+    lines.extend(ENV_FILE_DETECTION_DEFAULTS)
 
-    with open(env_path, "w") as f:
-        f.write("\n".join(lines))
+    env_path.write_text("\n".join(lines), encoding="utf-8")
 
     print_success(f"Created .env file: {env_path}")
 
 
-def generate_claude_config(project_dir: Path, venv_dir: Path, slack_config: Dict[str, Any], upstream_config: Dict[str, Any]) -> Dict[str, Any]:
+# Per-server detection overrides written to the generated Claude Desktop config:
+# GitHub servers only blocklist their read-only tools, other servers get the
+# filesystem server's lists
+GITHUB_DETECTION_BLOCKLIST = (
+    "read_file,get_file,list_files,search_code,get_issue,list_issues,"
+    "get_pull_request,list_pull_requests,search_repositories,get_repository,"
+    "list_repositories,get_user,list_users,search_users"
+)
+FILESYSTEM_DETECTION_ALLOWLIST = "write_file,edit_file,create_directory,move_file"
+FILESYSTEM_DETECTION_BLOCKLIST = "read_text_file,read_media_file,list_directory,get_file_info"
+
+
+def _is_github_remote(upstream_config: Dict[str, Any]) -> bool:
+    """Check whether the upstream is GitHub's hosted (HTTP) MCP server.
+
+    Args:
+        upstream_config: Upstream server configuration
+
+    Returns:
+        True for the remote GitHub server
+    """
+    return (
+        upstream_config.get("transport") == "http"
+        and "githubcopilot.com" in (upstream_config.get("url") or "")
+    )
+
+
+def _is_github_upstream(upstream_config: Dict[str, Any]) -> bool:
+    """Check whether the upstream is a GitHub MCP server (local or remote).
+
+    Args:
+        upstream_config: Upstream server configuration
+
+    Returns:
+        True for any GitHub MCP server
+    """
+    command = (upstream_config.get("command") or "").lower()
+    return "github" in command or _is_github_remote(upstream_config)
+
+
+def generate_claude_config(project_dir: Path, python_exe: Path, slack_config: Dict[str, Any], upstream_config: Dict[str, Any]) -> Dict[str, Any]:
     """Generate Claude Desktop MCP configuration.
 
     This config includes:
@@ -1020,23 +1318,24 @@ def generate_claude_config(project_dir: Path, venv_dir: Path, slack_config: Dict
     2. .env file - lower priority, global defaults and secrets
 
     This allows per-server overrides while .env provides global configuration.
+
+    Args:
+        project_dir: Project directory path
+        python_exe: Python executable of the virtual environment
+        slack_config: Slack configuration dict
+        upstream_config: Upstream server configuration dict
     """
-    python_exe = get_venv_python(venv_dir)
 
     # Set defaults based on upstream server type
-    is_github = (
-        upstream_config.get("command") == "github-mcp-server"
-        or "github" in upstream_config.get("command", "").lower()
-        or upstream_config.get("transport") == "http" and "githubcopilot.com" in upstream_config.get("url", "")
-    )
+    is_github = _is_github_upstream(upstream_config)
 
     # Only include upstream-server-specific configuration
     # Global settings (Slack, approvals, etc.) come from .env file
     env = {
         # Optional per-server detection overrides
         # These override global defaults from .env if needed
-        "DETECTION_ALLOWLIST": "" if is_github else "write_file,edit_file,create_directory,move_file",
-        "DETECTION_BLOCKLIST": "read_file,get_file,list_files,search_code,get_issue,list_issues,get_pull_request,list_pull_requests,search_repositories,get_repository,list_repositories,get_user,list_users,search_users" if is_github else "read_text_file,read_media_file,list_directory,get_file_info",
+        "DETECTION_ALLOWLIST": "" if is_github else FILESYSTEM_DETECTION_ALLOWLIST,
+        "DETECTION_BLOCKLIST": GITHUB_DETECTION_BLOCKLIST if is_github else FILESYSTEM_DETECTION_BLOCKLIST,
     }
 
     # Handle different transport types - this is server-specific config
@@ -1090,8 +1389,28 @@ def save_claude_config(config: Dict[str, Any], project_dir: Path) -> None:
     # Note: We no longer use Claude Desktop's "inputs" feature for tokens.
     # All secrets are stored in .env file and loaded by python-dotenv.
 
-    with open(config_path, "w") as f:
-        json.dump(output_config, f, indent=2)
+    # Indented because people copy from this file into their Claude Desktop config.
+    # It is small, so it is encoded in one go and written with a single call
+    # rather than streamed through json.dump's many small writes.
+    content = json.dumps(output_config, indent=2) + "\n"
+
+    # Leave an identical file (and its modification time) alone
+    try:
+        unchanged = config_path.read_text(encoding="utf-8") == content
+    except (OSError, UnicodeDecodeError):
+        unchanged = False
+    if unchanged:
+        print_success(f"Configuration unchanged: {config_path}")
+        return
+
+    # Write to a temporary file and swap it in, so an interrupted run can't leave
+    # a truncated config behind
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, config_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
     print_success(f"Saved configuration: {config_path}")
 
@@ -1122,18 +1441,18 @@ on_http_request:
           secret: "{signing_secret}"
 """
 
-    with open(policy_path, "w") as f:
-        f.write(content)
+    policy_path.write_text(content, encoding="utf-8")
 
     # Add to .gitignore if not already there
     gitignore_path = project_dir / ".gitignore"
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as f:
-            content = f.read()
+    try:
+        content = gitignore_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        content = None
 
-        if "ngrok-slack-policy.yml" not in content:
-            with open(gitignore_path, "a") as f:
-                f.write("\n# ngrok config with secrets\nngrok-slack-policy.yml\n")
+    if content is not None and "ngrok-slack-policy.yml" not in content:
+        with open(gitignore_path, "a", encoding="utf-8") as f:
+            f.write("\n# ngrok config with secrets\nngrok-slack-policy.yml\n")
 
     print_success(f"Created ngrok policy: {policy_path}")
     print_warning("Note: This file contains secrets - it has been added to .gitignore")
@@ -1141,37 +1460,11 @@ on_http_request:
     return policy_path
 
 
-def create_startup_scripts(project_dir: Path, venv_dir: Path, slack_config: Dict[str, Any], webex_config: Dict[str, Any], teams_config: Dict[str, Any], ngrok_config: Optional[Dict[str, Any]]) -> None:
-    """Create convenience startup scripts.
-
-    Args:
-        project_dir: Project directory path
-        venv_dir: Virtual environment directory path
-        slack_config: Slack configuration dict
-        webex_config: Webex configuration dict
-        teams_config: Teams configuration dict
-        ngrok_config: ngrok configuration dict (if applicable)
-    """
-    # Check if any platform needs webhooks
-    any_webhook = (slack_config.get("webhook_enabled") or
-                   webex_config.get("webhook_enabled") or
-                   teams_config.get("webhook_enabled"))
-
-    if not any_webhook:
-        return
-
-    print("\nCreating startup scripts...")
-
-    python_exe = get_venv_python(venv_dir)
-
-    # Always use the unified webhook server (supports Slack, Webex, and Teams)
-    webhook_script = "examples/unified_webhook_server.py"
-
-    if platform.system() == "Windows":
-        # Windows batch file
-        script_path = project_dir / "start_webhook.bat"
-        env_file = project_dir / ".env"
-        content = f"""@echo off
+# Startup script templates per platform, filled in with str.format
+STARTUP_SCRIPTS = {
+    "Windows": {
+        "extension": ".bat",
+        "webhook": """@echo off
 REM Start Unified Webhook Server (Slack, Webex, Teams)
 REM Generated by setup_wizard.py
 
@@ -1185,13 +1478,9 @@ if exist "{env_file}" (
 )
 
 echo Starting Webhook Server...
-"{python_exe}" {webhook_script.replace("/", "\\")}
-"""
-        if ngrok_config:
-            ngrok_script = project_dir / "start_ngrok.bat"
-            port = ngrok_config.get("port", "3000")
-            policy_file = project_dir / "ngrok-slack-policy.yml"
-            ngrok_content = f"""@echo off
+"{python_exe}" examples\\unified_webhook_server.py
+""",
+        "ngrok": """@echo off
 REM Start ngrok tunnel and automatically configure webhooks
 REM Generated by setup_wizard.py
 REM
@@ -1212,18 +1501,11 @@ cd /d "%~dp0"
 REM Use the Python script that auto-configures webhooks
 REM Use venv Python to ensure access to installed packages (webexteamssdk, etc.)
 "{python_exe}" scripts\\start_ngrok_with_webhooks.py
-"""
-            with open(ngrok_script, "w") as f:
-                f.write(ngrok_content)
-            print_success(f"Created: {ngrok_script}")
-            with open(ngrok_script, "w") as f:
-                f.write(ngrok_content)
-            print_success(f"Created: {ngrok_script}")
-    else:
-        # Unix shell script
-        script_path = project_dir / "start_webhook.sh"
-        env_file = project_dir / ".env"
-        content = f"""#!/bin/bash
+""",
+    },
+    "Unix": {
+        "extension": ".sh",
+        "webhook": """#!/bin/bash
 # Start Unified Webhook Server (Slack, Webex, Teams)
 # Generated by setup_wizard.py
 
@@ -1235,19 +1517,9 @@ if [ -f "{env_file}" ]; then
 fi
 
 echo "Starting Webhook Server..."
-"{python_exe}" {webhook_script}
-"""
-        with open(script_path, "w") as f:
-            f.write(content)
-        script_path.chmod(0o755)  # Make executable
-
-        if ngrok_config:
-            ngrok_script = project_dir / "start_ngrok.sh"
-            port = ngrok_config.get("port", "3000")
-            policy_file = project_dir / "ngrok-slack-policy.yml"
-            
-            # Use the new script that auto-configures webhooks
-            ngrok_content = f"""#!/bin/bash
+"{python_exe}" examples/unified_webhook_server.py
+""",
+        "ngrok": """#!/bin/bash
 # Start ngrok tunnel and automatically configure webhooks
 # Generated by setup_wizard.py
 #
@@ -1268,16 +1540,57 @@ cd "$(dirname "$0")"
 # Use the Python script that auto-configures webhooks
 # Use venv Python to ensure access to installed packages (webexteamssdk, etc.)
 "{python_exe}" scripts/start_ngrok_with_webhooks.py
-"""
-            with open(ngrok_script, "w") as f:
-                f.write(ngrok_content)
-            ngrok_script.chmod(0o755)  # Make executable
-            print_success(f"Created: {ngrok_script}")
+""",
+    },
+}
 
-    with open(script_path, "w") as f:
-        f.write(content)
 
-    print_success(f"Created: {script_path}")
+def create_startup_scripts(project_dir: Path, python_exe: Path, slack_config: Dict[str, Any], webex_config: Dict[str, Any], teams_config: Dict[str, Any], ngrok_config: Optional[Dict[str, Any]]) -> None:
+    """Create convenience startup scripts.
+
+    Args:
+        project_dir: Project directory path
+        python_exe: Python executable of the virtual environment
+        slack_config: Slack configuration dict
+        webex_config: Webex configuration dict
+        teams_config: Teams configuration dict
+        ngrok_config: ngrok configuration dict (if applicable)
+    """
+    # Check if any platform needs webhooks
+    any_webhook = (slack_config.get("webhook_enabled") or
+                   webex_config.get("webhook_enabled") or
+                   teams_config.get("webhook_enabled"))
+
+    if not any_webhook:
+        return
+
+    print("\nCreating startup scripts...")
+
+    # Windows batch files, or Unix shell scripts everywhere else
+    is_windows = SYSTEM == "Windows"
+    templates = STARTUP_SCRIPTS["Windows" if is_windows else "Unix"]
+    values = {
+        "python_exe": python_exe,
+        "env_file": project_dir / ".env",
+        "port": (ngrok_config or {}).get("port", "3000"),
+    }
+
+    # Always start the unified webhook server (supports Slack, Webex, and Teams)
+    script_names = ["webhook", "ngrok"] if ngrok_config else ["webhook"]
+    for name in script_names:
+        script_path = project_dir / f"start_{name}{templates['extension']}"
+        script_path.write_text(templates[name].format(**values))
+        if not is_windows:
+            script_path.chmod(0o755)  # Make executable
+        print_success(f"Created: {script_path}")
+
+
+# Where Claude Desktop keeps its config, by operating system
+CLAUDE_CONFIG_PATHS = {
+    "Darwin": "~/Library/Application Support/Claude/claude_desktop_config.json",
+    "Windows": "%APPDATA%\\Claude\\claude_desktop_config.json",
+}
+DEFAULT_CLAUDE_CONFIG_PATH = "~/.config/Claude/claude_desktop_config.json"
 
 
 def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], webex_config: Dict[str, Any], teams_config: Dict[str, Any], ngrok_config: Optional[Dict[str, Any]], claude_config: Dict[str, Any]) -> None:
@@ -1300,13 +1613,7 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
     print(f"   Copy the contents of: {Colors.CYAN}claude_desktop_config_generated.json{Colors.END}")
     print(f"   to your Claude Desktop config file:")
 
-    system = platform.system()
-    if system == "Darwin":
-        config_path = "~/Library/Application Support/Claude/claude_desktop_config.json"
-    elif system == "Windows":
-        config_path = "%APPDATA%\\Claude\\claude_desktop_config.json"
-    else:
-        config_path = "~/.config/Claude/claude_desktop_config.json"
+    config_path = CLAUDE_CONFIG_PATHS.get(SYSTEM, DEFAULT_CLAUDE_CONFIG_PATH)
 
     print(f"   {Colors.YELLOW}{config_path}{Colors.END}")
 
@@ -1318,7 +1625,7 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
     if any_webhook:
         print(f"\n{Colors.BOLD}2. Start the Webhook Server:{Colors.END}")
 
-        if platform.system() == "Windows":
+        if SYSTEM == "Windows":
             print(f"   {Colors.CYAN}start_webhook.bat{Colors.END}")
         else:
             print(f"   {Colors.CYAN}./start_webhook.sh{Colors.END}")
@@ -1326,7 +1633,7 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
         if ngrok_config:
             print(f"\n{Colors.BOLD}3. Start ngrok (in another terminal):{Colors.END}")
 
-            if platform.system() == "Windows":
+            if SYSTEM == "Windows":
                 print(f"   {Colors.CYAN}start_ngrok.bat{Colors.END}")
             else:
                 print(f"   {Colors.CYAN}./start_ngrok.sh{Colors.END}")
@@ -1368,7 +1675,7 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
     print(f"   {Colors.CYAN}\"Create a file called test.txt with content 'Hello, World!'\"{Colors.END}")
     print("   You should see an approval request in your configured platform(s)!")
 
-    print("\n" + "─" * 70)
+    print(f"\n{SECTION_BAR}")
     print(f"{Colors.GREEN}✓ All setup files have been generated!{Colors.END}")
     print(f"{Colors.GREEN}✓ Virtual environment created with all dependencies{Colors.END}")
 
@@ -1386,7 +1693,7 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
 
     if any_webhook and ngrok_config:
         print(f"{Colors.GREEN}✓ ngrok configuration created for webhook tunneling{Colors.END}")
-    print("─" * 70)
+    print(SECTION_BAR)
 
     print(f"\n📚 For more information, see:")
     print(f"   {Colors.CYAN}README.md{Colors.END} - General setup")
@@ -1399,22 +1706,57 @@ def print_final_instructions(project_dir: Path, slack_config: Dict[str, Any], we
     print()
 
 
+def is_package_installed(venv_dir: Path, package: str) -> bool:
+    """Check a virtual environment's site-packages for a package's metadata.
+
+    Looks for the {name}-{version}.dist-info directory that pip creates for every
+    install (editable ones included), without starting the venv's Python.
+
+    Args:
+        venv_dir: Virtual environment directory
+        package: Distribution name
+
+    Returns:
+        True if the package's metadata directory was found
+    """
+    wanted = normalize_package_name(package)
+    if SYSTEM == "Windows":
+        site_dirs = [venv_dir / "Lib" / "site-packages"]
+    else:
+        site_dirs = list((venv_dir / "lib").glob("python*/site-packages"))
+
+    for site_dir in site_dirs:
+        try:
+            with os.scandir(site_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".dist-info"):
+                        continue
+                    name = entry.name[:-len(".dist-info")].rsplit("-", 1)[0]
+                    if normalize_package_name(name) == wanted:
+                        return True
+        except OSError:
+            continue
+    return False
+
+
 def check_setup_complete(project_dir: Path) -> bool:
     """Check if setup is already complete."""
     venv_dir = project_dir / ".venv"
-    venv_python = venv_dir / "bin" / "python"
-    if platform.system() == "Windows":
-        venv_python = venv_dir / "Scripts" / "python.exe"
+    venv_python = get_venv_python(venv_dir)
     
     # Check if venv exists and has Python
     if not venv_python.exists():
         return False
     
-    # Check if package is installed
+    # Check if package is installed: look for pip's metadata directory first,
+    # and only ask pip itself if it isn't where a standard venv keeps it
+    if is_package_installed(venv_dir, "cite-before-act-mcp"):
+        return True
     try:
         result = run_command(
-            [str(venv_python), "-m", "pip", "show", "cite-before-act-mcp"],
-            check=False
+            pip_command(venv_python, "show", "cite-before-act-mcp"),
+            check=False,
+            timeout=PROBE_TIMEOUT,
         )
         return result.returncode == 0
     except Exception:
@@ -1429,11 +1771,9 @@ def load_existing_claude_config(project_dir: Path) -> Optional[Dict[str, Any]]:
         or None if no config exists
     """
     config_path = project_dir / "claude_desktop_config_generated.json"
-    if not config_path.exists():
-        return None
-    
     try:
-        with open(config_path, "r") as f:
+        # A missing file raises here too, so it needs no separate check
+        with open(config_path, "r", encoding="utf-8") as f:
             data = json.load(f)
             # Handle both formats: {"mcpServers": {...}} or direct mcpServers dict
             if "mcpServers" in data:
@@ -1444,6 +1784,13 @@ def load_existing_claude_config(project_dir: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+# Server name sanitizing: underscores and spaces become dashes, anything other
+# than letters, digits and dashes is dropped, and runs of dashes are collapsed
+SERVER_NAME_SEPARATORS = re.compile(r"[_ ]")
+SERVER_NAME_INVALID_CHARS = re.compile(r"[^\w-]")
+SERVER_NAME_DASHES = re.compile(r"-{2,}")
+
+
 def generate_server_name(upstream_config: Dict[str, Any], existing_config: Optional[Dict[str, Any]]) -> str:
     """Generate a unique server name for the new configuration.
     
@@ -1467,9 +1814,9 @@ def generate_server_name(upstream_config: Dict[str, Any], existing_config: Optio
     
     # Check for known servers
     # Check for remote GitHub server first (HTTP transport)
-    if upstream_config.get("transport") == "http" and "githubcopilot.com" in upstream_config.get("url", ""):
+    if _is_github_remote(upstream_config):
         upstream_name = "github-remote"
-    elif "github" in command or "github-mcp-server" in command:
+    elif "github" in command:
         upstream_name = "github"
     elif "filesystem" in command or "server-filesystem" in combined:
         upstream_name = "filesystem"
@@ -1501,14 +1848,14 @@ def generate_server_name(upstream_config: Dict[str, Any], existing_config: Optio
             upstream_name = "custom"
     
     # Sanitize the name (remove invalid characters, ensure it's a valid identifier)
-    upstream_name = upstream_name.replace("_", "-").replace(" ", "-")
+    upstream_name = SERVER_NAME_SEPARATORS.sub("-", upstream_name)
     # Remove any remaining invalid characters
-    upstream_name = "".join(c for c in upstream_name if c.isalnum() or c == "-")
+    upstream_name = SERVER_NAME_INVALID_CHARS.sub("", upstream_name)
     # Remove leading/trailing dashes and collapse multiple dashes
-    upstream_name = "-".join(part for part in upstream_name.split("-") if part)
+    upstream_name = SERVER_NAME_DASHES.sub("-", upstream_name).strip("-")
     
     # If we couldn't determine a name, use a default
-    if not upstream_name or upstream_name == "-":
+    if not upstream_name:
         upstream_name = "mcp"
     
     # Create base name with -cite suffix
@@ -1530,20 +1877,50 @@ def generate_server_name(upstream_config: Dict[str, Any], existing_config: Optio
     return f"{base_name}-{counter}"
 
 
-def merge_claude_config(existing_config: Optional[Dict[str, Any]], new_config: Dict[str, Any], server_name: str) -> Dict[str, Any]:
-    """Merge new configuration with existing Claude Desktop configuration."""
+def merge_claude_config(
+    existing_config: Optional[Dict[str, Any]],
+    new_config: Dict[str, Any],
+    server_name: str,
+    *,
+    copy: bool = False,
+) -> Dict[str, Any]:
+    """Merge new configuration with existing Claude Desktop configuration.
+
+    By default the existing configuration is updated in place and returned, so
+    the caller takes ownership of it: anything still needed from the original
+    contents (e.g. the names of the servers that were already configured) must
+    be taken before calling this. Pass copy=True to leave it untouched.
+
+    Args:
+        existing_config: Existing mcpServers content, or None
+        new_config: Configuration of the server to add
+        server_name: Name to add it under
+        copy: Return a new dict instead of updating existing_config
+
+    Returns:
+        mcpServers content including the new server
+    """
     if not existing_config:
         return {server_name: new_config}
-    
-    merged = existing_config.copy()
-    merged[server_name] = new_config
-    return merged
+    if copy:
+        return {**existing_config, server_name: new_config}
+
+    existing_config[server_name] = new_config
+    return existing_config
 
 
 def main():
     """Main setup function."""
     print_header("Cite-Before-Act MCP - Interactive Setup")
 
+    if not sys.stdin.isatty():
+        print_warning("Input is not a terminal: answers are read from stdin, "
+                      "and prompts left unanswered use their defaults")
+
+    # Check for Node.js and ngrok in the background while the user answers prompts
+    start_tool_version_probe(NODE_VERSION_CMD)
+    start_tool_version_probe(NGROK_VERSION_CMD)
+
     # Get project directory
     project_dir = Path(__file__).parent.resolve()
     
@@ -1609,11 +1986,11 @@ def main():
 
         # Step 2: Create virtual environment
         print_step(2, 7, "Creating Virtual Environment")
-        venv_dir = create_venv(project_dir, python_exe)
+        venv_dir, venv_python = create_venv(project_dir, python_exe)
 
         # Step 3: Install dependencies
         print_step(3, 7, "Installing Dependencies")
-        install_dependencies(venv_dir, project_dir)
+        install_dependencies(venv_python, project_dir)
 
         # Step 4: Configure messaging platforms
         print_step(4, 7, "Configuring Messaging Platforms")
@@ -1637,8 +2014,11 @@ def main():
 
         # Generate Claude Desktop config
         server_name = generate_server_name(upstream_config, existing_claude_config)
-        claude_config_entry = generate_claude_config(project_dir, venv_dir, slack_config, upstream_config)
-        merged_config = merge_claude_config(existing_claude_config, claude_config_entry["cite-before-act"], server_name)
+        claude_config_entry = generate_claude_config(project_dir, venv_python, slack_config, upstream_config)
+        # existing_claude_config is not used after this, so it can be merged into directly
+        merged_config = merge_claude_config(
+            existing_claude_config, claude_config_entry["cite-before-act"], server_name, copy=False
+        )
 
         # Save config (all secrets now in .env, not in Claude Desktop config)
         final_config = {"mcpServers": merged_config}
@@ -1649,7 +2029,7 @@ def main():
             create_ngrok_policy(project_dir, slack_config["signing_secret"])
 
         # Create startup scripts
-        create_startup_scripts(project_dir, venv_dir, slack_config, webex_config, teams_config, ngrok_config)
+        create_startup_scripts(project_dir, venv_python, slack_config, webex_config, teams_config, ngrok_config)
 
         # Print final instructions
         print_final_instructions(project_dir, slack_config, webex_config, teams_config, ngrok_config, {"mcpServers": merged_config})
@@ -1658,9 +2038,7 @@ def main():
         # Add new server mode
         # Use existing venv
         venv_dir = project_dir / ".venv"
-        venv_python = venv_dir / "bin" / "python"
-        if platform.system() == "Windows":
-            venv_python = venv_dir / "Scripts" / "python.exe"
+        venv_python = get_venv_python(venv_dir)
         
         if not venv_python.exists():
             print_error("Virtual environment not found. Please run full setup first.")
@@ -1668,30 +2046,26 @@ def main():
         
         # Check if dependencies need updating (e.g., after git pull with new requirements)
         print_step(1, 3, "Checking Dependencies")
-        missing_deps = []
         required_deps = ["httpx", "fastmcp", "slack-sdk", "pydantic", "python-dotenv"]
-        
-        for dep in required_deps:
-            result = run_command(
-                [str(venv_python), "-m", "pip", "show", dep],
-                check=False
-            )
-            if result.returncode != 0:
-                missing_deps.append(dep)
+        installed = get_installed_packages(venv_python)
+        missing_deps = [dep for dep in required_deps if normalize_package_name(dep) not in installed]
         
         if missing_deps:
             print_warning(f"Missing dependencies detected: {', '.join(missing_deps)}")
             print("This can happen after updating the code (e.g., git pull) with new requirements.")
             if prompt_yes_no("\nUpdate dependencies now?", default=True):
                 print("Updating dependencies...")
-                # Install/upgrade dependencies from requirements.txt
+                # Install/upgrade dependencies from requirements.txt and reinstall the
+                # package in editable mode (to pick up any code changes) in one pip
+                # run, so the overlapping requirements are resolved only once
                 run_command(
-                    [str(venv_python), "-m", "pip", "install", "-r", str(project_dir / "requirements.txt")]
-                )
-                # Also reinstall the package in editable mode to pick up any code changes
-                run_command(
-                    [str(venv_python), "-m", "pip", "install", "--use-pep517", "-e", "."],
-                    cwd=project_dir
+                    pip_command(
+                        venv_python, "install",
+                        "-r", str(project_dir / "requirements.txt"),
+                        "--use-pep517", "-e", ".",
+                    ),
+                    cwd=project_dir,
+                    show_output=True,
                 )
                 print_success("Dependencies updated")
             else:
@@ -1699,40 +2073,25 @@ def main():
         else:
             print_success("All dependencies are installed")
         
-        # Load existing platform configs from .env if it exists
         slack_config = {"enabled": False}
         webex_config = {"enabled": False}
         teams_config = {"enabled": False}
+        # Load existing platform configs from .env (nothing to load if it's missing)
         env_path = project_dir / ".env"
-        if env_path.exists():
-            # Try to load platform configs from .env
-            with open(env_path, "r") as f:
-                for line in f:
-                    # Slack
-                    if line.startswith("ENABLE_SLACK="):
-                        slack_config["enabled"] = line.split("=", 1)[1].strip().lower() == "true"
-                    elif line.startswith("SLACK_BOT_TOKEN="):
-                        slack_config["bot_token"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("SLACK_CHANNEL="):
-                        slack_config["channel"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("SLACK_USER_ID="):
-                        slack_config["user_id"] = line.split("=", 1)[1].strip()
-                    # Webex
-                    elif line.startswith("ENABLE_WEBEX="):
-                        webex_config["enabled"] = line.split("=", 1)[1].strip().lower() == "true"
-                    elif line.startswith("WEBEX_BOT_TOKEN="):
-                        webex_config["bot_token"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("WEBEX_ROOM_ID="):
-                        webex_config["room_id"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("WEBEX_PERSON_EMAIL="):
-                        webex_config["person_email"] = line.split("=", 1)[1].strip()
-                    # Teams
-                    elif line.startswith("ENABLE_TEAMS="):
-                        teams_config["enabled"] = line.split("=", 1)[1].strip().lower() == "true"
-                    elif line.startswith("TEAMS_APP_ID="):
-                        teams_config["app_id"] = line.split("=", 1)[1].strip()
-                    elif line.startswith("TEAMS_APP_PASSWORD="):
-                        teams_config["app_password"] = line.split("=", 1)[1].strip()
+        env_values = read_env_file(env_path)
+        for platform_config, enable_key, fields in (
+            (slack_config, "ENABLE_SLACK",
+             {"bot_token": "SLACK_BOT_TOKEN", "channel": "SLACK_CHANNEL", "user_id": "SLACK_USER_ID"}),
+            (webex_config, "ENABLE_WEBEX",
+             {"bot_token": "WEBEX_BOT_TOKEN", "room_id": "WEBEX_ROOM_ID", "person_email": "WEBEX_PERSON_EMAIL"}),
+            (teams_config, "ENABLE_TEAMS",
+             {"app_id": "TEAMS_APP_ID", "app_password": "TEAMS_APP_PASSWORD"}),
+        ):
+            if enable_key in env_values:
+                platform_config["enabled"] = env_values[enable_key].lower() == "true"
+            for field, key in fields.items():
+                if key in env_values:
+                    platform_config[field] = env_values[key]
         
         # Configure upstream server
         print_step(2, 3, "Configuring Upstream MCP Server")
@@ -1740,34 +2099,15 @@ def main():
 
         # If GitHub server, ensure token is added to .env
         if "github_token" in upstream_config and upstream_config.get("github_token"):
-            # Check if .env exists and has GitHub token
-            env_path = project_dir / ".env"
-            has_github_token = False
-            if env_path.exists():
-                try:
-                    with open(env_path, "r") as f:
-                        content = f.read()
-                        for line in content.split("\n"):
-                            if line.startswith("GITHUB_PERSONAL_ACCESS_TOKEN=") and "=" in line:
-                                value = line.split("=", 1)[1].strip()
-                                if value:
-                                    has_github_token = True
-                                    break
-                except Exception:
-                    pass
+            # Check if .env already has a GitHub token
+            has_github_token = bool(env_values.get("GITHUB_PERSONAL_ACCESS_TOKEN"))
 
             # Add token if not already present
             if not has_github_token:
                 print("\nAdding GitHub token to .env file...")
                 try:
-                    with open(env_path, "a") as f:
-                        f.write("\n# -----------------------------------------------------------------------------\n")
-                        f.write("# GitHub Configuration (Global)\n")
-                        f.write("# -----------------------------------------------------------------------------\n")
-                        f.write("# GitHub Personal Access Token (global secret)\n")
-                        f.write("# Get from: https://github.com/settings/tokens\n")
-                        f.write("# Required scopes: repo, workflow, write:packages, delete:packages, admin:org\n")
-                        f.write(f"GITHUB_PERSONAL_ACCESS_TOKEN={upstream_config['github_token']}\n")
+                    with open(env_path, "a", encoding="utf-8") as f:
+                        f.write(ENV_FILE_GITHUB_SECTION.format(token=upstream_config["github_token"]))
                     print_success(f"Added GitHub token to .env file")
                 except Exception as e:
                     print_error(f"Could not add GitHub token to .env: {e}")
@@ -1777,8 +2117,12 @@ def main():
         
         # Generate Claude Desktop config entry
         server_name = generate_server_name(upstream_config, existing_claude_config)
-        claude_config_entry = generate_claude_config(project_dir, venv_dir, slack_config, upstream_config)
-        merged_config = merge_claude_config(existing_claude_config, claude_config_entry["cite-before-act"], server_name)
+        claude_config_entry = generate_claude_config(project_dir, venv_python, slack_config, upstream_config)
+        # Merging updates existing_claude_config in place; remember what was there before
+        preexisting_names = list(existing_claude_config or ())
+        merged_config = merge_claude_config(
+            existing_claude_config, claude_config_entry["cite-before-act"], server_name, copy=False
+        )
 
         # Save config (all secrets now in .env, not in Claude Desktop config)
         final_config = {"mcpServers": merged_config}
@@ -1791,9 +2135,9 @@ def main():
         print(f"2. Copy the '{server_name}' entry to your Claude Desktop config file")
         print(f"3. Restart Claude Desktop")
         
-        if existing_claude_config:
+        if preexisting_names:
             print(f"\n{Colors.YELLOW}Note:{Colors.END} Your existing configurations are preserved:")
-            for existing_name in existing_claude_config.keys():
+            for existing_name in preexisting_names:
                 print(f"  • {existing_name}")
 
     return 0